@@ -12,6 +12,9 @@ Import as:
 
 from .serial_cli import SerialCLI
 from .storage import FlipperStorage
+from .entry import DirEntry
+from .backup import BackupRepository
+from .transport import RecordingTransport, ReplayTransport
 from .exceptions import (
     FlipperFilesystemError,
     ConnectionError,
@@ -34,6 +37,10 @@ __license__ = "MIT"
 __all__ = [
     "SerialCLI",
     "FlipperStorage",
+    "DirEntry",
+    "BackupRepository",
+    "RecordingTransport",
+    "ReplayTransport",
     "FlipperFilesystemError",
     "ConnectionError",
     "FileNotFoundError",
@@ -0,0 +1,167 @@
+"""Incremental, content-addressed backups of Flipper Zero storage.
+
+A repository holds file contents once per MD5 under ``objects/`` and one
+JSON manifest per snapshot under ``snapshots/``, mapping each path to its
+size and MD5. Since the device computes MD5s itself, a backup only
+downloads content the repository does not hold yet, whichever device or
+snapshot it came from.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+from .exceptions import ReadError
+
+
+class BackupRepository:
+    """Local content-addressed store of device snapshots."""
+
+    MANIFEST_VERSION = 1
+
+    def __init__(self, repo_dir: str):
+        """Initialize repository, creating its layout if needed."""
+        self.repo_dir = repo_dir
+        self.objects_dir = os.path.join(repo_dir, "objects")
+        self.snapshots_dir = os.path.join(repo_dir, "snapshots")
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.snapshots_dir, exist_ok=True)
+
+    def snapshots(self) -> List[str]:
+        """Return snapshot names, oldest first."""
+        return sorted(
+            name[: -len(".json")]
+            for name in os.listdir(self.snapshots_dir)
+            if name.endswith(".json")
+        )
+
+    def load_manifest(self, name: str = None) -> Optional[Dict]:
+        """Load a snapshot manifest, the latest one by default."""
+        if name is None:
+            names = self.snapshots()
+            if not names:
+                return None
+            name = names[-1]
+
+        with open(os.path.join(self.snapshots_dir, f"{name}.json")) as f:
+            return json.load(f)
+
+    def object_path(self, md5: str) -> str:
+        return os.path.join(self.objects_dir, md5[:2], md5)
+
+    def has_object(self, md5: str) -> bool:
+        return os.path.exists(self.object_path(md5))
+
+    def backup(self, storage, remote_root: str, name: str = None) -> str:
+        """Snapshot remote_root, downloading only content not stored yet.
+
+        Returns the snapshot name.
+        """
+        remote_root = remote_root.rstrip("/") or "/"
+        files = {}
+        directories = []
+        downloaded = 0
+
+        for entry_type, path, size in storage.walk(remote_root):
+            relative = path[len(remote_root) :].lstrip("/")
+            if entry_type == "directory":
+                directories.append(relative)
+                continue
+
+            md5 = storage.md5(path)
+            if not self.has_object(md5):
+                self._store_object(storage, path, md5)
+                downloaded += 1
+            files[relative] = {"size": size, "md5": md5}
+
+        name = name or self._new_snapshot_name()
+        manifest = {
+            "version": self.MANIFEST_VERSION,
+            "name": name,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "device": storage.capabilities.uid,
+            "remote_root": remote_root,
+            "directories": sorted(directories),
+            "files": files,
+        }
+        with open(os.path.join(self.snapshots_dir, f"{name}.json"), "w") as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+
+        self.logger.info(
+            f"Snapshot {name}: {len(files)} files, {downloaded} downloaded"
+        )
+        return name
+
+    def restore(
+        self, storage, snapshot: str = None, remote_root: str = None
+    ) -> List[str]:
+        """Push a snapshot back to the device, uploading only differences.
+
+        Files whose device MD5 already matches are left untouched. Returns
+        the remote paths that were written.
+        """
+        manifest = self.load_manifest(snapshot)
+        if manifest is None:
+            raise ReadError(f"No snapshot to restore in {self.repo_dir}")
+
+        remote_root = (remote_root or manifest["remote_root"]).rstrip("/") or "/"
+        current = {}
+        if storage.exists(remote_root):
+            for entry_type, path, size in storage.walk(remote_root):
+                current[path] = (entry_type, size)
+        else:
+            storage.mkdir(remote_root)
+
+        for relative in manifest["directories"]:
+            path = f"{remote_root}/{relative}"
+            if path not in current:
+                storage.mkdir(path)
+
+        pending = {}
+        for relative, record in sorted(manifest["files"].items()):
+            path = f"{remote_root}/{relative}"
+            existing = current.get(path)
+            if existing is not None:
+                if existing[1] == record["size"] and storage.md5(path) == record["md5"]:
+                    continue
+                # Chunk writes append, start from an empty file
+                storage.remove(path)
+            pending[path] = self.object_path(record["md5"])
+
+        # Objects are streamed from disk in pipelined batches
+        if pending:
+            storage.write_many(pending)
+        written = list(pending)
+
+        self.logger.info(f"Restored {len(written)} files to {remote_root}")
+        return written
+
+    def _store_object(self, storage, source: str, md5: str):
+        """Stream content into the store, verified against its MD5.
+
+        Content is hashed as it is written to a temporary file, which only
+        replaces the object once it matches.
+        """
+        path = self.object_path(md5)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        try:
+            storage.read_to(source, temp_path, verify=True, expected_md5=md5)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        os.replace(temp_path, path)
+
+    def _new_snapshot_name(self) -> str:
+        """Return a timestamp name not used by another snapshot."""
+        base = time.strftime("%Y%m%dT%H%M%S")
+        name = base
+        existing = set(self.snapshots())
+        counter = 1
+        while name in existing:
+            name = f"{base}-{counter}"
+            counter += 1
+        return name
@@ -0,0 +1,149 @@
+"""Firmware capability probing for Flipper Zero devices.
+
+Official and custom firmware builds differ in the CLI commands and
+`storage` subcommands they support. A probe parses `device_info`, `help`
+and the `storage` usage once, and the result is cached on disk by device
+UID and firmware version so reconnecting to a known device skips it.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Iterable, Optional
+from . import parsers
+
+
+class DeviceCapabilities:
+    """Commands and storage subcommands supported by a device.
+
+    chunk_offsets tells whether `storage read_chunks` accepts a start
+    offset; it is only set by a probe, so unprobed devices read whole files.
+    """
+
+    CACHE_VERSION = 2
+
+    def __init__(
+        self,
+        uid: str = None,
+        firmware_version: str = None,
+        firmware_origin: str = None,
+        commands: Iterable[str] = (),
+        storage_commands: Iterable[str] = (),
+        chunk_offsets: bool = False,
+    ):
+        self.uid = uid
+        self.firmware_version = firmware_version
+        self.firmware_origin = firmware_origin
+        self.commands = frozenset(commands)
+        self.storage_commands = frozenset(storage_commands)
+        self.chunk_offsets = chunk_offsets
+
+    def supports(self, storage_command: str) -> bool:
+        """Check if a `storage` subcommand is available.
+
+        Unknown (unprobed) capabilities are assumed supported.
+        """
+        if not self.storage_commands:
+            return True
+        return storage_command in self.storage_commands
+
+    @property
+    def rpc(self) -> bool:
+        """Whether the CLI can switch to a protobuf RPC session."""
+        return "start_rpc_session" in self.commands
+
+    @property
+    def cache_key(self) -> Optional[str]:
+        """File-safe cache key, None if the device cannot be identified."""
+        if not self.uid or not self.firmware_version:
+            return None
+        key = f"{self.uid}-{self.firmware_origin or 'unknown'}-{self.firmware_version}"
+        return "".join(c if c.isalnum() or c in "-_." else "_" for c in key)
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": self.CACHE_VERSION,
+            "uid": self.uid,
+            "firmware_version": self.firmware_version,
+            "firmware_origin": self.firmware_origin,
+            "commands": sorted(self.commands),
+            "storage_commands": sorted(self.storage_commands),
+            "chunk_offsets": self.chunk_offsets,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "DeviceCapabilities":
+        return cls(
+            uid=data.get("uid"),
+            firmware_version=data.get("firmware_version"),
+            firmware_origin=data.get("firmware_origin"),
+            commands=data.get("commands", ()),
+            storage_commands=data.get("storage_commands", ()),
+            chunk_offsets=data.get("chunk_offsets", False),
+        )
+
+
+def default_cache_dir() -> str:
+    """Return the per-user capability cache directory."""
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "flipperfs", "capabilities")
+
+
+def probe_capabilities(
+    cli, cache_dir: str = None, refresh: bool = False
+) -> DeviceCapabilities:
+    """Identify the device and return its capabilities, cached on disk."""
+    logger = logging.getLogger(__name__)
+    cache_dir = cache_dir or default_cache_dir()
+
+    command = "device_info"
+    info = parsers.parse_key_values(
+        parsers.strip_response(cli.send_command_raw(command), command)
+    )
+    identity = DeviceCapabilities(
+        uid=info.get("hardware_uid"),
+        firmware_version=info.get("firmware_version"),
+        firmware_origin=info.get("firmware_origin_fork"),
+    )
+
+    cache_path = None
+    if identity.cache_key:
+        cache_path = os.path.join(cache_dir, f"{identity.cache_key}.json")
+        if not refresh and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                data = json.load(f)
+            if data.get("version") == DeviceCapabilities.CACHE_VERSION:
+                logger.debug(f"Using cached capabilities {cache_path}")
+                return DeviceCapabilities.from_dict(data)
+
+    command = "help"
+    commands = parsers.parse_help_commands(
+        parsers.strip_response(cli.send_command_raw(command), command)
+    )
+    command = "storage"
+    usage = parsers.parse_usage_descriptions(
+        parsers.strip_response(cli.send_command_raw(command), command)
+    )
+    capabilities = DeviceCapabilities(
+        uid=identity.uid,
+        firmware_version=identity.firmware_version,
+        firmware_origin=identity.firmware_origin,
+        commands=commands,
+        storage_commands=usage.keys(),
+        # Stock read_chunks only takes a chunk size, ranged reads need an
+        # offset argument advertised in the usage text
+        chunk_offsets="offset" in usage.get("read_chunks", ""),
+    )
+    logger.info(
+        f"Probed {len(capabilities.commands)} commands and "
+        f"{len(capabilities.storage_commands)} storage subcommands"
+    )
+
+    if cache_path:
+        os.makedirs(cache_dir, exist_ok=True)
+        with open(cache_path, "w") as f:
+            json.dump(capabilities.to_dict(), f)
+
+    return capabilities
@@ -0,0 +1,50 @@
+"""Compact directory entry objects."""
+
+from typing import Dict, Optional, Union
+
+
+class DirEntry:
+    """Directory entry yielded by FlipperStorage.iterdir.
+
+    Uses __slots__ and computes the full path only when accessed, so huge
+    directories can be streamed without a dict and a path string per entry.
+    """
+
+    __slots__ = ("parent", "name", "type", "size")
+
+    def __init__(self, parent: str, name: str, type: str, size: Optional[int]):
+        self.parent = parent
+        self.name = name
+        self.type = type
+        self.size = size
+
+    @property
+    def path(self) -> str:
+        return f"{self.parent}/{self.name}"
+
+    def is_file(self) -> bool:
+        return self.type == "file"
+
+    def is_dir(self) -> bool:
+        return self.type == "directory"
+
+    def to_dict(self) -> Dict[str, Union[str, int]]:
+        """Convert to the dict format returned by FlipperStorage.list."""
+        entry = {"type": self.type, "name": self.name}
+        if self.size is not None:
+            entry["size"] = self.size
+        entry["path"] = self.path
+        return entry
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, DirEntry):
+            return NotImplemented
+        return (self.parent, self.name, self.type, self.size) == (
+            other.parent,
+            other.name,
+            other.type,
+            other.size,
+        )
+
+    def __repr__(self) -> str:
+        return f"DirEntry({self.path!r}, type={self.type!r}, size={self.size!r})"
@@ -1,5 +1,13 @@
 """FlipperFS extras - optional specialized modules."""
 
-from .subghz import SubGhzStorage
+from .subghz import SubGhzStorage, SignalCatalog, TempSignalPool
 
-__all__ = ["SubGhzStorage"]
+__all__ = ["SubGhzStorage", "SignalCatalog", "TempSignalPool"]
+
+# Optional fsspec filesystem
+try:
+    from .filesystem import FlipperFileSystem
+
+    __all__.append("FlipperFileSystem")
+except ImportError:
+    FlipperFileSystem = None
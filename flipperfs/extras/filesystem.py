@@ -0,0 +1,260 @@
+"""fsspec filesystem implementation backed by FlipperStorage.
+
+Requires the optional ``fsspec`` dependency:
+    pip install flipper-fs[fsspec]
+"""
+
+from typing import Dict, List, Optional, Union
+from fsspec.spec import AbstractBufferedFile, AbstractFileSystem
+from ..storage import FlipperStorage
+from ..utils import normalize_path
+from ..exceptions import FileNotFoundError as FlipperFileNotFoundError
+
+
+class FlipperFileSystem(AbstractFileSystem):
+    """fsspec filesystem for Flipper Zero storage.
+
+    Directory listings are kept in fsspec's ``dircache`` and invalidated
+    on every mutation. Reads go through block-cached random-access files
+    on top of the chunked read path, writes through buffered files.
+    """
+
+    protocol = ("flipper",)
+    root_marker = "/"
+    DEFAULT_BLOCK_SIZE = 4096
+    DEFAULT_CACHE_TYPE = "blockcache"
+
+    def __init__(
+        self,
+        port: str = "/dev/ttyACM0",
+        baud_rate: int = None,
+        storage: FlipperStorage = None,
+        **kwargs,
+    ):
+        """Initialize filesystem, reusing an open storage if given."""
+        super().__init__(**kwargs)
+        self.storage = storage or FlipperStorage(port, baud_rate)
+
+    @classmethod
+    def _strip_protocol(cls, path):
+        """Strip flipper:// prefix and normalize the remaining path."""
+        if isinstance(path, list):
+            return [cls._strip_protocol(p) for p in path]
+        path = super()._strip_protocol(path)
+        return normalize_path(path)
+
+    def ls(
+        self, path: str, detail: bool = True, refresh: bool = False, **kwargs
+    ) -> Union[List[Dict], List[str]]:
+        """List directory content, served from the listing cache if possible."""
+        path = self._strip_protocol(path)
+
+        # Only exact listings: fsspec's parent lookup also matches directories
+        entries = None if refresh else self.dircache.get(path)
+        if entries is None:
+            if path == self.root_marker:
+                stats = {"type": "directory"}
+            else:
+                stats = self.storage.stat(path)
+            if stats is None:
+                raise FileNotFoundError(path)
+            if stats["type"] == "file":
+                entries = [self._entry(path, stats)]
+            else:
+                entries = [
+                    self._entry(self._join(path, entry["name"]), entry)
+                    for entry in self.storage.list(path)
+                ]
+                self.dircache[path] = entries
+
+        if detail:
+            return entries
+        return [entry["name"] for entry in entries]
+
+    def info(self, path: str, **kwargs) -> Dict:
+        """Get file or directory details."""
+        path = self._strip_protocol(path)
+
+        # Prefer the parent listing cache over a device round trip
+        parent = self._parent(path)
+        if path != parent:
+            cached = self._ls_from_cache(parent) or []
+            for entry in cached:
+                if entry["name"] == path:
+                    return entry
+
+        if path == self.root_marker:
+            return {"name": path, "size": 0, "type": "directory"}
+
+        stats = self.storage.stat(path)
+        if stats is None:
+            raise FileNotFoundError(path)
+        return self._entry(path, stats)
+
+    def _open(
+        self,
+        path: str,
+        mode: str = "rb",
+        block_size: int = None,
+        autocommit: bool = True,
+        cache_options: Optional[Dict] = None,
+        **kwargs,
+    ) -> "FlipperFile":
+        """Open a block-cached file for reading or a buffered file for writing."""
+        return FlipperFile(
+            self,
+            path,
+            mode=mode,
+            block_size=block_size or self.DEFAULT_BLOCK_SIZE,
+            autocommit=autocommit,
+            cache_type=kwargs.pop("cache_type", self.DEFAULT_CACHE_TYPE),
+            cache_options=cache_options,
+            **kwargs,
+        )
+
+    def cat_file(self, path: str, start: int = None, end: int = None, **kwargs):
+        """Read whole file, or a byte range of it."""
+        path = self._strip_protocol(path)
+        if start is None and end is None:
+            try:
+                return self.storage.read_binary(path)
+            except FlipperFileNotFoundError:
+                raise FileNotFoundError(path)
+        return super().cat_file(path, start=start, end=end, **kwargs)
+
+    def rm_file(self, path: str):
+        """Remove a single file."""
+        path = self._strip_protocol(path)
+        self.storage.remove(path)
+        self.invalidate_cache(path)
+
+    def _rm(self, path: str):
+        """Remove a file or an empty directory."""
+        self.rm_file(path)
+
+    def rmdir(self, path: str):
+        """Remove an empty directory."""
+        self.rm_file(path)
+
+    def mkdir(self, path: str, create_parents: bool = True, **kwargs):
+        """Create directory, including missing parents by default."""
+        path = self._strip_protocol(path)
+        if create_parents:
+            self.makedirs(path, exist_ok=True)
+            return
+        self.storage.mkdir(path)
+        self.invalidate_cache(path)
+
+    def makedirs(self, path: str, exist_ok: bool = False):
+        """Create directory and all missing parents."""
+        path = self._strip_protocol(path)
+        if self.exists(path):
+            if not exist_ok:
+                raise FileExistsError(path)
+            return
+
+        parent = self._parent(path)
+        if parent != path and not self.exists(parent):
+            self.makedirs(parent, exist_ok=True)
+        self.storage.mkdir(path)
+        self.invalidate_cache(path)
+
+    def cp_file(self, path1: str, path2: str, **kwargs):
+        """Copy file on the device, without transferring data."""
+        path1 = self._strip_protocol(path1)
+        path2 = self._strip_protocol(path2)
+        self.storage.copy(path1, path2)
+        self.invalidate_cache(path2)
+
+    def mv(self, path1: str, path2: str, recursive: bool = False, **kwargs):
+        """Move file or directory on the device with a single rename."""
+        path1 = self._strip_protocol(path1)
+        path2 = self._strip_protocol(path2)
+        self.storage.rename(path1, path2)
+        self.invalidate_cache(path1)
+        self.invalidate_cache(path2)
+
+    def invalidate_cache(self, path: str = None):
+        """Drop cached listings for path and its parent, or all if path is None."""
+        if path is None:
+            self.dircache.clear()
+            return
+
+        path = self._strip_protocol(path)
+        self.dircache.pop(path, None)
+        self.dircache.pop(self._parent(path), None)
+        super().invalidate_cache(path)
+
+    @staticmethod
+    def _join(directory: str, name: str) -> str:
+        """Join directory and entry name."""
+        return normalize_path(f"{directory}/{name}")
+
+    @staticmethod
+    def _entry(path: str, stats: Dict) -> Dict:
+        """Convert a FlipperStorage stat/list entry to fsspec format."""
+        return {
+            "name": path,
+            "size": stats.get("size", 0),
+            "type": stats["type"],
+        }
+
+
+class FlipperFile(AbstractBufferedFile):
+    """Buffered file on Flipper storage.
+
+    Reads fetch byte ranges on demand through the chunked read path,
+    writes are flushed to the device as appended chunks.
+    """
+
+    # Whole file content, only used without ranged reads
+    _content: Optional[bytes] = None
+
+    def read(self, length: int = -1) -> bytes:
+        """Read up to length bytes, never requesting blocks past EOF."""
+        if self.mode == "rb" and length >= 0:
+            length = min(length, max(0, self.size - self.loc))
+        return super().read(length)
+
+    def _fetch_range(self, start: int, end: int) -> bytes:
+        """Fetch bytes [start, end) from the device.
+
+        Without ranged reads every fetch would transfer the whole file, so
+        it is streamed once and later ranges are sliced from memory.
+        """
+        if not self.fs.storage.capabilities.chunk_offsets:
+            if self._content is None:
+                self._content = self.fs.storage.read_binary(self.path)
+            return self._content[start:end]
+
+        data = b""
+        offset = start
+        while offset < end:
+            length = min(self.blocksize, end - offset)
+            chunk = self.fs.storage.read_chunk(self.path, offset, length)
+            data += chunk
+            if len(chunk) < length:
+                break  # End of file
+            offset += length
+        return data
+
+    def _initiate_upload(self):
+        """Truncate any existing file, since chunk writes append.
+
+        In "ab" mode the existing content is kept and appended to.
+        """
+        if self.mode == "ab":
+            return
+        if self.fs.storage.exists(self.path):
+            self.fs.storage.remove(self.path)
+
+    def _upload_chunk(self, final: bool = False) -> bool:
+        """Append the buffered data to the remote file."""
+        data = self.buffer.getvalue()
+        if data:
+            self.fs.storage.write_binary(self.path, data)
+        elif final and self.offset == 0:
+            self.fs.storage.write(self.path, "")  # Create empty file
+        if final:
+            self.fs.invalidate_cache(self.path)
+        return True
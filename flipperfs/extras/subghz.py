@@ -1,26 +1,94 @@
 """Sub-GHz specific filesystem operations."""
 
-from typing import Dict, List
+import hashlib
+import json
+from array import array
+import os
+import posixpath
+import queue
+import threading
+from contextlib import closing, contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from .. import parsers
 from ..storage import FlipperStorage
-from ..utils import create_sub_content
+from ..utils import create_sub_content, encode_text_lines, normalize_path
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+RAW_DATA_KEY = "RAW_Data"
+RAW_VALUES_PER_LINE = 512
+
+
+def parse_raw_data(lines: Iterable[str]) -> Tuple[Dict[str, str], "array"]:
+    """Parse a RAW .sub file from an iterable of lines.
+
+    Returns the header fields and all RAW_Data timings concatenated as a
+    compact int32 array (NumPy array when available, array.array otherwise).
+    Lines are consumed one at a time, so the file is never held in memory.
+    """
+    header = {}
+    timings = array("i")
+    prefix = RAW_DATA_KEY + ":"
+
+    for line in lines:
+        if line.startswith(prefix):
+            timings.extend(map(int, line[len(prefix) :].split()))
+        elif ":" in line:
+            key, value = line.split(":", 1)
+            header[key.strip()] = value.strip()
+
+    if np is not None:
+        timings = np.frombuffer(timings, dtype=np.int32)
+
+    return header, timings
+
+
+def encode_raw_data(
+    timings, values_per_line: int = RAW_VALUES_PER_LINE
+) -> Iterator[str]:
+    """Encode timings into RAW_Data lines, wrapped like the firmware does.
+
+    Only one line of values is converted to Python ints at a time.
+    """
+    if not hasattr(timings, "__getitem__"):
+        timings = array("i", timings)
+    for i in range(0, len(timings), values_per_line):
+        chunk = timings[i : i + values_per_line]
+        if hasattr(chunk, "tolist"):
+            chunk = chunk.tolist()
+        yield f"{RAW_DATA_KEY}: {' '.join(map(str, chunk))}"
+
+
+def create_raw_sub_content(
+    timings,
+    frequency: int = 433920000,
+    preset: str = "FuriHalSubGhzPresetOok650Async",
+) -> Iterator[str]:
+    """Yield RAW .sub file lines from timings."""
+    yield "Filetype: Flipper SubGhz RAW File"
+    yield "Version: 1"
+    yield f"Frequency: {frequency}"
+    yield f"Preset: {preset}"
+    yield "Protocol: RAW"
+    yield from encode_raw_data(timings)
 
 
 class SubGhzStorage(FlipperStorage):
     """Extended storage operations for Sub-GHz files."""
 
     DEFAULT_SUBGHZ_PATH = "/any/subghz"
+    RAW_UPLOAD_BATCH = 64 * 1024
 
     def list_signals(self, directory: str = None) -> List[str]:
         """List all .sub signal files."""
         directory = directory or self.DEFAULT_SUBGHZ_PATH
-        entries = self.list(directory)
-
-        signals = []
-        for entry in entries:
-            if entry["type"] == "file" and entry["name"].endswith(".sub"):
-                signals.append(entry["path"])
-
-        return signals
+        return [
+            entry.path
+            for entry in self.iterdir(directory, entry_type="file", suffix=".sub")
+        ]
 
     def read_signal(self, signal_name: str) -> Dict[str, str]:
         """Read and parse .sub file content."""
@@ -41,6 +109,51 @@ class SubGhzStorage(FlipperStorage):
 
         return signal_data
 
+    def read_raw_signal(self, signal_name: str) -> Tuple[Dict[str, str], "array"]:
+        """Read RAW .sub file, returning header and int32 timings.
+
+        The file is streamed once and parsed line by line as it arrives.
+        """
+        return parse_raw_data(self.iter_lines(self._signal_path(signal_name)))
+
+    def write_raw_signal(
+        self,
+        signal_name: str,
+        timings,
+        frequency: int = 433920000,
+        preset: str = "FuriHalSubGhzPresetOok650Async",
+    ) -> bool:
+        """Create a RAW .sub file, streaming encoded lines to the device.
+
+        Lines are buffered into batches uploaded with pipelined chunk
+        writes, so memory use is bounded by the batch size and no fixed
+        sleeps are paid per chunk.
+        """
+        if not signal_name.endswith(".sub"):
+            signal_name += ".sub"
+        signal_path = self._signal_path(signal_name)
+
+        # Chunk writes append, start from an empty file
+        if self.exists(signal_path):
+            self.remove(signal_path)
+
+        batch = bytearray()
+        for line in create_raw_sub_content(timings, frequency, preset):
+            batch += f"{line}\n".encode()
+            if len(batch) >= self.RAW_UPLOAD_BATCH:
+                self.write_many({signal_path: bytes(batch)})
+                batch.clear()
+        if batch:
+            self.write_many({signal_path: bytes(batch)})
+
+        return True
+
+    def _signal_path(self, signal_name: str) -> str:
+        """Resolve bare signal names against the default Sub-GHz directory."""
+        if not signal_name.startswith("/"):
+            return f"{self.DEFAULT_SUBGHZ_PATH}/{signal_name}"
+        return signal_name
+
     def write_signal(
         self,
         signal_name: str,
@@ -73,8 +186,255 @@ class SubGhzStorage(FlipperStorage):
         """Create temporary signal file and return path."""
         import time
 
-        temp_name = f"_temp_{int(time.time())}.sub"
+        # Nanosecond resolution avoids collisions within the same second
+        temp_name = f"_temp_{time.time_ns()}.sub"
         temp_path = f"{self.DEFAULT_SUBGHZ_PATH}/{temp_name}"
 
         self.write_signal(temp_path, hex_key, **kwargs)
         return temp_path
+
+    def temp_signal_pool(self, size: int = 4, directory: str = None):
+        """Create a pool of reusable temporary signal slots."""
+        return TempSignalPool(self, size=size, directory=directory)
+
+
+class SignalCatalog:
+    """Persistent index of Sub-GHz signal headers.
+
+    Only the header of each .sub file is parsed, and a refresh re-reads only
+    files whose size or MD5 changed. Queries never touch the device.
+    """
+
+    INDEX_VERSION = 1
+    HEADER_KEYS = ("Frequency", "Preset", "Protocol", "Bit")
+    INT_KEYS = ("Frequency", "Bit")
+    # Header parsing stops at the first payload line
+    DATA_KEYS = ("Key", "RAW_Data", "Data")
+
+    def __init__(self, storage: SubGhzStorage, index_path: str = None):
+        """Initialize catalog, loading a persisted index if present."""
+        self.storage = storage
+        self.index_path = index_path
+        self.signals: Dict[str, Dict[str, Union[str, int, None]]] = {}
+
+        if index_path and os.path.exists(index_path):
+            self.load(index_path)
+
+    def refresh(
+        self, directory: str = None, check_md5: bool = True
+    ) -> Dict[str, List[str]]:
+        """Synchronize the index with a device directory.
+
+        Files with an unchanged size are only re-read if their MD5 differs
+        (skipped when check_md5 is False). Returns added, updated and
+        removed paths.
+        """
+        directory = normalize_path(directory or self.storage.DEFAULT_SUBGHZ_PATH)
+        changes = {"added": [], "updated": [], "removed": []}
+
+        # The listing must be complete before md5 and read commands are sent
+        entries = list(
+            self.storage.iterdir(directory, entry_type="file", suffix=".sub")
+        )
+
+        seen = set()
+        for entry in entries:
+            path = entry.path
+            seen.add(path)
+            indexed = self.signals.get(path)
+            md5 = None
+
+            if indexed is not None and indexed["size"] == entry.size:
+                if not check_md5:
+                    continue
+                md5 = self.storage.md5(path)
+                if md5 == indexed["md5"]:
+                    continue
+
+            if check_md5 and md5 is None:
+                md5 = self.storage.md5(path)
+
+            record = {"size": entry.size, "md5": md5}
+            record.update(self._read_header(path))
+            self.signals[path] = record
+            changes["added" if indexed is None else "updated"].append(path)
+
+        for path in list(self.signals):
+            if posixpath.dirname(path) == directory and path not in seen:
+                del self.signals[path]
+                changes["removed"].append(path)
+
+        if self.index_path:
+            self.save()
+
+        return changes
+
+    def find(
+        self,
+        frequency: int = None,
+        protocol: str = None,
+        preset: str = None,
+        bit: int = None,
+    ) -> List[str]:
+        """Return paths of indexed signals matching all given criteria."""
+        criteria = {
+            "Frequency": frequency,
+            "Protocol": protocol,
+            "Preset": preset,
+            "Bit": bit,
+        }
+        criteria = {key: value for key, value in criteria.items() if value is not None}
+
+        return sorted(
+            path
+            for path, record in self.signals.items()
+            if all(record.get(key) == value for key, value in criteria.items())
+        )
+
+    def get(self, path: str) -> Optional[Dict[str, Union[str, int, None]]]:
+        """Return indexed header of a signal, if any."""
+        return self.signals.get(path)
+
+    def save(self, index_path: str = None):
+        """Persist index as JSON."""
+        index_path = index_path or self.index_path
+        with open(index_path, "w") as f:
+            json.dump({"version": self.INDEX_VERSION, "signals": self.signals}, f)
+
+    def load(self, index_path: str = None):
+        """Load index from JSON, ignoring incompatible versions."""
+        index_path = index_path or self.index_path
+        with open(index_path) as f:
+            data = json.load(f)
+
+        if data.get("version") == self.INDEX_VERSION:
+            self.signals = data["signals"]
+
+    def _read_header(self, path: str) -> Dict[str, Union[str, int]]:
+        """Read header fields from a single streamed read.
+
+        Parsing stops at the signal payload; the rest of the response is
+        drained, but never buffered.
+        """
+        header = {}
+        with closing(self.storage.iter_lines(path)) as lines:
+            for line in lines:
+                if ":" not in line:
+                    continue
+                key, value = line.split(":", 1)
+                key = key.strip()
+                if key in self.DATA_KEYS:
+                    break
+                if key in self.HEADER_KEYS:
+                    value = value.strip()
+                    if key in self.INT_KEYS and value.isdigit():
+                        value = int(value)
+                    header[key] = value
+                    if len(header) == len(self.HEADER_KEYS):
+                        break
+
+        return header
+
+
+class TempSignalPool:
+    """Fixed set of reusable temporary signal files.
+
+    Slots are overwritten in place instead of creating a new file per
+    transmission, and uploads are skipped when a slot already holds the
+    rendered content. Each slot is handed out to one user at a time.
+    """
+
+    SLOT_NAME = "_temp_slot_{index}.sub"
+
+    def __init__(self, storage: SubGhzStorage, size: int = 4, directory: str = None):
+        """Initialize pool of size slots in directory."""
+        self.storage = storage
+        directory = normalize_path(directory or storage.DEFAULT_SUBGHZ_PATH)
+        self.slots = [
+            f"{directory}/{self.SLOT_NAME.format(index=i)}" for i in range(size)
+        ]
+        self._free = queue.Queue()
+        for slot in self.slots:
+            self._free.put(slot)
+        self._contents: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, timeout: float = None) -> str:
+        """Reserve a free slot, blocking until one is available."""
+        try:
+            return self._free.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError("No free temporary signal slot")
+
+    def release(self, slot: str):
+        """Return a slot to the pool."""
+        self._free.put(slot)
+
+    @contextmanager
+    def slot(self, timeout: float = None):
+        """Reserve a slot for the duration of a with block."""
+        slot = self.acquire(timeout)
+        try:
+            yield slot
+        finally:
+            self.release(slot)
+
+    def write(self, slot: str, hex_key: str, **kwargs) -> bool:
+        """Write signal to slot, returns False if the upload was skipped."""
+        content = create_sub_content(hex_key=hex_key, **kwargs)
+
+        # Serial link is shared, device writes are serialized
+        with self._lock:
+            cached = self._contents.get(slot)
+            if cached == content:
+                return False
+            self._contents.pop(slot, None)
+
+            # Writes append, so clear the slot first, unless a slot left
+            # behind by an earlier run already holds the same bytes
+            if cached is not None:
+                self.storage.remove(slot)
+            else:
+                stats = self.storage.stat(slot)
+                if stats is not None:
+                    payload = b"".join(encode_text_lines(content))
+                    if (
+                        stats.get("size") == len(payload)
+                        and self.storage.md5(slot) == hashlib.md5(payload).hexdigest()
+                    ):
+                        self._contents[slot] = content
+                        return False
+                    self.storage.remove(slot)
+
+            self.storage.write(slot, content)
+            self._contents[slot] = content
+
+        return True
+
+    @contextmanager
+    def signal(self, hex_key: str, timeout: float = None, **kwargs):
+        """Reserve a slot holding the given signal and yield its path."""
+        with self.slot(timeout) as slot:
+            self.write(slot, hex_key, **kwargs)
+            yield slot
+
+    def cleanup(self):
+        """Remove every slot from the device with one pipelined batch.
+
+        Slots that were never written may not exist, so only errors for
+        written slots are logged.
+        """
+        with self._lock:
+            commands = [f"storage remove {slot}" for slot in self.slots]
+            responses = self.storage.cli.send_commands(commands)
+            for slot, command, response in zip(self.slots, commands, responses):
+                error = parsers.find_error(parsers.strip_response(response, command))
+                if error and slot in self._contents:
+                    self.storage.logger.warning(f"Failed to remove {slot}: {error}")
+            self._contents.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.cleanup()
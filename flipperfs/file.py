@@ -0,0 +1,159 @@
+"""Seekable raw file objects for Flipper Zero storage."""
+
+import io
+from collections import OrderedDict
+from .exceptions import FileNotFoundError
+
+
+class FlipperFileReader(io.RawIOBase):
+    """Random-access reader fetching chunks at offsets on demand.
+
+    Sequential reads trigger a read-ahead window that fetches several
+    chunks in a single round trip. Recently used chunks are kept in a
+    small LRU cache so that re-reading or seeking back is free.
+
+    Without ranged reads (see DeviceCapabilities.chunk_offsets) any read
+    transfers the whole file, so it is fetched once on first access and
+    served from memory.
+    """
+
+    def __init__(
+        self,
+        storage,
+        file_path: str,
+        chunk_size: int = 1024,
+        read_ahead: int = 4,
+        cache_chunks: int = 8,
+    ):
+        """Initialize reader, looking up the file size."""
+        super().__init__()
+        stats = storage.stat(file_path)
+        if stats is None or stats["type"] != "file":
+            raise FileNotFoundError(f"File not found: {file_path}")
+
+        self.storage = storage
+        self.name = file_path
+        self.size = stats["size"]
+        self.chunk_size = chunk_size
+        self.read_ahead = max(1, read_ahead)
+        self.cache_chunks = max(self.read_ahead, cache_chunks)
+        self._chunks = OrderedDict()
+        self._position = 0
+        self._last_index = None
+        self._content = None
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        """Move to a new position, no data is transferred."""
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = self.size + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+
+        if position < 0:
+            raise ValueError(f"Negative seek position {position}")
+        self._position = position
+        return position
+
+    def readinto(self, buffer) -> int:
+        """Read into a pre-allocated buffer, fetching chunks as needed."""
+        if self._position >= self.size:
+            return 0
+
+        view = memoryview(buffer).cast("B")
+        length = min(len(view), self.size - self._position)
+        written = 0
+        while written < length:
+            index, start = divmod(self._position, self.chunk_size)
+            chunk = self._get_chunk(index)
+            count = min(len(chunk) - start, length - written)
+            if count <= 0:
+                break  # File shrank while reading
+            view[written : written + count] = chunk[start : start + count]
+            written += count
+            self._position += count
+
+        return written
+
+    def _get_chunk(self, index: int) -> bytes:
+        """Return chunk at index, from cache or from the device."""
+        if not self.storage.capabilities.chunk_offsets:
+            if self._content is None:
+                self._content = self.storage.read_binary(self.name)
+            start = index * self.chunk_size
+            return self._content[start : start + self.chunk_size]
+
+        if index in self._chunks:
+            self._chunks.move_to_end(index)
+            self._last_index = index
+            return self._chunks[index]
+
+        # Only pay for read-ahead on sequential access
+        sequential = self._last_index is not None and index == self._last_index + 1
+        count = self.read_ahead if sequential else 1
+        last_index = (self.size - 1) // self.chunk_size
+        count = min(count, last_index - index + 1)
+
+        offset = index * self.chunk_size
+        data = self.storage.read_chunk(self.name, offset, count * self.chunk_size)
+        for i in range(count):
+            chunk = data[i * self.chunk_size : (i + 1) * self.chunk_size]
+            if not chunk and i > 0:
+                break
+            self._chunks[index + i] = chunk
+
+        while len(self._chunks) > self.cache_chunks:
+            self._chunks.popitem(last=False)
+
+        self._last_index = index
+        return self._chunks[index]
+
+
+class FlipperFileWriter(io.RawIOBase):
+    """Append-only writer streaming data into write_chunk commands."""
+
+    def __init__(
+        self, storage, file_path: str, chunk_size: int = 1024, append: bool = False
+    ):
+        """Initialize writer, truncating the file unless appending."""
+        super().__init__()
+        self.storage = storage
+        self.name = file_path
+        self.chunk_size = chunk_size
+        self._append = append
+        self._position = 0
+
+        if not append and storage.exists(file_path):
+            storage.remove(file_path)
+
+    def writable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def write(self, data) -> int:
+        """Send data to the device as one or more chunks."""
+        data = bytes(data)
+        if data:
+            self.storage.write_binary(self.name, data, chunk_size=self.chunk_size)
+            self._position += len(data)
+        return len(data)
+
+    def close(self):
+        """Close writer, creating the file if nothing was written."""
+        if not self.closed and not self._append and self._position == 0:
+            self.storage.write(self.name, "")
+        super().close()
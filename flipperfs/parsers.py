@@ -0,0 +1,232 @@
+"""Bytes-level parsers for Flipper CLI responses.
+
+Every parser takes the raw response bytes of a single command and works in
+one pass with precompiled patterns, without decoding the whole response or
+splitting it into lists of lines. Parsers have no I/O dependencies so they
+can be fuzzed and benchmarked on their own.
+"""
+
+import re
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+PROMPT = b">:"
+
+# [F] name 123b / [D] name, as printed by `storage list` and `storage tree`
+_ENTRY_RE = re.compile(
+    rb"^[ \t]*\[(?:F\][ \t]+(?P<file>[^\r\n]+?)[ \t]+(?P<size>\d+)b"
+    rb"|D\][ \t]+(?P<dir>[^\r\n]+?))[ \t]*\r?$",
+    re.M,
+)
+_KEY_VALUE_RE = re.compile(
+    rb"^(?!>)[ \t]*(?P<key>[^:\r\n]*?)[ \t]*:[ \t]*(?P<value>[^\r\n]*?)[ \t]*\r?$",
+    re.M,
+)
+_STAT_FILE_RE = re.compile(rb"File, size: (\d+)b")
+_STAT_DIR_RE = re.compile(rb"^[ \t]*(?:Dir|Storage,)", re.M)
+_SIZE_RE = re.compile(rb"^Size:[ \t]*(\d+)[^\n]*\n", re.M)
+_HEX_LINE_RE = re.compile(rb"^[0-9A-Fa-f \t]+\r?$", re.M)
+_MD5_RE = re.compile(rb"^[ \t]*([0-9a-f]{32})[ \t]*\r?$", re.M)
+# Error lines start with the message, so entry names and command echoes
+# containing "Error" are not mistaken for one
+_ERROR_RE = re.compile(rb"^[ \t]*(?:Storage error|Error\b|error:)[^\r\n]*", re.M)
+# Command list lines of `help`, headers end with a colon
+_HELP_LINE_RE = re.compile(rb"^(?![^\r\n]*:)[^\r\n]+", re.M)
+# Indented subcommand names of a usage text, e.g. "\tread_chunks\t - ..."
+_USAGE_COMMAND_RE = re.compile(rb"^[ \t]+([a-z][a-z0-9_]*)\b([^\r\n]*)", re.M)
+
+
+def _decode(data: bytes) -> str:
+    return data.decode("utf-8", errors="replace")
+
+
+def _body_bounds(response: bytes, command: str = None) -> Tuple[int, int]:
+    """Return start and end offsets of the response without echo and prompt."""
+    start = 0
+    if command:
+        newline = response.find(b"\n")
+        if newline != -1 and command.encode() in response[:newline]:
+            start = newline + 1
+
+    end = response.rfind(PROMPT)
+    if end == -1 or end < start:
+        end = len(response)
+    else:
+        # Drop the whole prompt line
+        newline = response.rfind(b"\n", start, end)
+        end = newline + 1 if newline != -1 else start
+
+    return start, end
+
+
+def strip_response(response: bytes, command: str = None) -> bytes:
+    """Strip the command echo and the trailing prompt."""
+    start, end = _body_bounds(response, command)
+    return response[start:end]
+
+
+def split_responses(data: bytes) -> List[bytes]:
+    """Split the output of pipelined commands after each prompt."""
+    responses = []
+    start = 0
+    index = data.find(PROMPT)
+    while index != -1:
+        end = index + len(PROMPT)
+        responses.append(data[start:end])
+        start = end
+        index = data.find(PROMPT, start)
+    return responses
+
+
+def find_error(response: bytes) -> Optional[str]:
+    """Return the first error line of a response, if any.
+
+    Only lines starting with an error message count, so listings of files
+    such as "Error_2024.txt" are not reported as errors.
+    """
+    match = _ERROR_RE.search(response)
+    return _decode(match.group(0)).strip() if match else None
+
+
+def parse_entries(
+    response: bytes, entry_type: str = None, suffix: str = None
+) -> Iterator[Tuple[str, str, Optional[int]]]:
+    """Yield (type, name, size) for each entry of a list or tree response.
+
+    Entries can be filtered by type ("file" or "directory") and name suffix;
+    filtering happens before names are decoded.
+    """
+    suffix = suffix.encode() if suffix else None
+    for match in _ENTRY_RE.finditer(response):
+        name = match.group("file")
+        if name is not None:
+            if entry_type == "directory" or (suffix and not name.endswith(suffix)):
+                continue
+            yield "file", _decode(name), int(match.group("size"))
+        else:
+            name = match.group("dir")
+            if entry_type == "file" or (suffix and not name.endswith(suffix)):
+                continue
+            yield "directory", _decode(name), None
+
+
+def parse_key_values(response: bytes) -> Dict[str, str]:
+    """Parse "key: value" lines, ignoring prompt lines."""
+    return {
+        _decode(match.group("key")): _decode(match.group("value"))
+        for match in _KEY_VALUE_RE.finditer(response)
+    }
+
+
+def parse_help_commands(response: bytes) -> Set[str]:
+    """Parse command names from `help` output."""
+    return {
+        _decode(word)
+        for match in _HELP_LINE_RE.finditer(response)
+        for word in match.group(0).split()
+    }
+
+
+def parse_usage_commands(response: bytes) -> Set[str]:
+    """Parse subcommand names from a usage text, e.g. of `storage`."""
+    return {_decode(match.group(1)) for match in _USAGE_COMMAND_RE.finditer(response)}
+
+
+def parse_usage_descriptions(response: bytes) -> Dict[str, str]:
+    """Map subcommand names of a usage text to the rest of their line."""
+    return {
+        _decode(match.group(1)): _decode(match.group(2)).strip()
+        for match in _USAGE_COMMAND_RE.finditer(response)
+    }
+
+
+def parse_stat(response: bytes) -> Optional[Tuple[str, Optional[int]]]:
+    """Parse `storage stat` output into (type, size)."""
+    match = _STAT_FILE_RE.search(response)
+    if match:
+        return "file", int(match.group(1))
+    if _STAT_DIR_RE.search(response):
+        return "directory", None
+    return None
+
+
+def parse_read(response: bytes) -> Optional[bytes]:
+    """Extract file content from `storage read` output.
+
+    Returns None if the response has no Size header (file not found).
+    """
+    match = _SIZE_RE.search(response)
+    if not match:
+        return None
+
+    start = match.end()
+    size = int(match.group(1))
+    _, end = _body_bounds(response)
+    if end < start:
+        end = start
+    if start + size <= end:
+        return response[start : start + size]
+
+    return response[start:end].rstrip(b"\r\n")
+
+
+def parse_hex_data(response: bytes) -> Optional[bytes]:
+    """Decode hex dump lines of `storage read_chunks` output.
+
+    Returns None if the response has no Size header.
+    """
+    if b"Size:" not in response:
+        return None
+
+    hex_data = b"".join(match.group(0) for match in _HEX_LINE_RE.finditer(response))
+    # fromhex skips ASCII whitespace, so matched lines are joined as-is
+    return bytes.fromhex(hex_data.decode("ascii"))
+
+
+def parse_md5(response: bytes) -> Optional[str]:
+    """Extract MD5 hex digest from `storage md5` output."""
+    match = _MD5_RE.search(response)
+    return match.group(1).decode("ascii") if match else None
+
+
+class ReadStream:
+    """Incremental parser of `storage read` output.
+
+    Chunks are fed as they arrive and only file content is returned, using
+    the Size header to know where content ends. The echo before the header
+    and the prompt after the content are never returned.
+    """
+
+    def __init__(self):
+        self.size: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.finished = False
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> bytes:
+        """Consume a chunk and return the content bytes it contains."""
+        if self.finished:
+            return b""
+
+        if self.size is None:
+            self._buffer += chunk
+            match = _SIZE_RE.search(self._buffer)
+            if match is None:
+                # Prompt without header: file not found
+                self.finished = PROMPT in self._buffer
+                return b""
+            self.size = self.remaining = int(match.group(1))
+            chunk = bytes(self._buffer[match.end() :])
+            self._buffer.clear()
+
+        content = b""
+        if self.remaining:
+            content = chunk[: self.remaining]
+            self.remaining -= len(content)
+            chunk = chunk[len(content) :]
+
+        if not self.remaining:
+            # Keep a short tail to detect a prompt split across chunks
+            self._buffer = self._buffer[-len(PROMPT) :] + chunk
+            self.finished = PROMPT in self._buffer
+
+        return content
@@ -3,7 +3,10 @@
 import serial
 import time
 import logging
+from typing import Iterator, List
+from . import parsers
 from .exceptions import ConnectionError
+from .transport import RecordingTransport
 
 
 class SerialCLI:
@@ -14,13 +17,26 @@ class SerialCLI:
     COMMAND_TIMEOUT = 3
     PROMPT = b">:"
 
-    def __init__(self, port: str = "/dev/ttyACM0", baud_rate: int = None):
-        """Initialize serial connection to Flipper."""
+    def __init__(
+        self,
+        port: str = "/dev/ttyACM0",
+        baud_rate: int = None,
+        transport=None,
+        record_path: str = None,
+    ):
+        """Initialize serial connection to Flipper.
+
+        An already open serial-like transport (e.g. a ReplayTransport) can be
+        given instead of a port. With record_path, the session is recorded.
+        """
         self.port = port
         self.baud_rate = baud_rate or self.DEFAULT_BAUD_RATE
-        self.serial = None
+        self.serial = transport
         self.logger = logging.getLogger(__name__)
-        self.connect()
+        if self.serial is None:
+            self.connect()
+        if record_path:
+            self.serial = RecordingTransport(self.serial, record_path)
 
     def connect(self):
         """Establish serial connection (supports serial ports and network URLs)."""
@@ -63,7 +79,14 @@ class SerialCLI:
             raise ConnectionError(f"Failed to connect to {self.port}: {e}")
 
     def send_command(self, command: str, timeout: float = None) -> str:
-        """Send command and return response."""
+        """Send command and return decoded response."""
+        response = self.send_command_raw(command, timeout)
+        decoded = response.decode("utf-8", errors="replace")
+        self.logger.debug(f"Response: {decoded[:100]}...")
+        return decoded
+
+    def send_command_raw(self, command: str, timeout: float = None) -> bytes:
+        """Send command and return undecoded response bytes."""
         if not self.serial or not self.serial.is_open:
             raise ConnectionError("Serial connection not open")
 
@@ -75,25 +98,79 @@ class SerialCLI:
         self.serial.flush()
 
         # Read response until prompt
-        response = b""
-        start_time = time.time()
+        return self.read_available(timeout)
+
+    def send_commands(
+        self, commands: List[str], timeout: float = None, window: int = 8
+    ) -> List[bytes]:
+        """Send commands pipelined and return their raw responses.
+
+        Up to window commands are written at once, without waiting for each
+        prompt, so short commands are not limited by round-trip latency. The
+        returned list is shorter than commands if a batch timed out.
+        """
+        payloads = [f"{command}\r".encode() for command in commands]
+        return self.send_pipelined(payloads, timeout, window)
+
+    def send_pipelined(
+        self, payloads: List[bytes], timeout: float = None, window: int = 8
+    ) -> List[bytes]:
+        """Send raw payloads pipelined, each answered by one prompt."""
+        if not self.serial or not self.serial.is_open:
+            raise ConnectionError("Serial connection not open")
 
-        while time.time() - start_time < timeout:
-            # Try to read up to 4096 bytes (will return less if not available)
+        timeout = timeout or self.COMMAND_TIMEOUT
+        responses = []
+
+        for start in range(0, len(payloads), window):
+            batch = payloads[start : start + window]
+            self.logger.debug(f"Sending {len(batch)} pipelined commands")
+            self.serial.write(b"".join(batch))
+            self.serial.flush()
+
+            data = bytearray()
+            prompts = 0
+            deadline = time.time() + timeout * len(batch)
+            while prompts < len(batch) and time.time() < deadline:
+                chunk = self.serial.read(min(4096, max(1, self.serial.in_waiting or 1)))
+                if chunk:
+                    search_from = max(0, len(data) - len(self.PROMPT) + 1)
+                    data += chunk
+                    prompts += data.count(self.PROMPT, search_from)
+                else:
+                    time.sleep(0.01)  # Short sleep if no data
+
+            batch_responses = parsers.split_responses(bytes(data))
+            responses.extend(batch_responses)
+            if len(batch_responses) < len(batch):
+                break  # Timed out, device state is unknown
+
+        return responses
+
+    def stream_command(self, command: str, timeout: float = None) -> Iterator[bytes]:
+        """Send command and yield response chunks as they arrive.
+
+        Stops after timeout seconds without data. Callers detect the end of
+        the response themselves and stop iterating.
+        """
+        if not self.serial or not self.serial.is_open:
+            raise ConnectionError("Serial connection not open")
+
+        timeout = timeout or self.COMMAND_TIMEOUT
+        self.logger.debug(f"Streaming: {command}")
+
+        self.serial.write(f"{command}\r".encode())
+        self.serial.flush()
+
+        last_data = time.time()
+        while time.time() - last_data < timeout:
             chunk = self.serial.read(min(4096, max(1, self.serial.in_waiting or 1)))
             if chunk:
-                response += chunk
-
-                # Exit early if prompt marker detected
-                if self.PROMPT in response:
-                    break
+                last_data = time.time()
+                yield chunk
             else:
                 time.sleep(0.01)  # Short sleep if no data
 
-        decoded = response.decode("utf-8", errors="replace")
-        self.logger.debug(f"Response: {decoded[:100]}...")
-        return decoded
-
     def send_raw(self, data: bytes):
         """Send raw bytes without waiting for response."""
         if not self.serial or not self.serial.is_open:
@@ -103,22 +180,24 @@ class SerialCLI:
 
     def read_available(self, timeout: float = 1) -> bytes:
         """Read all available data within timeout, exits early if prompt detected."""
-        data = b""
+        data = bytearray()
         start_time = time.time()
 
         while time.time() - start_time < timeout:
             # Try to read up to 4096 bytes (will return less if not available)
             chunk = self.serial.read(min(4096, max(1, self.serial.in_waiting or 1)))
             if chunk:
+                # Only scan the new bytes (and a possibly split prompt)
+                search_from = max(0, len(data) - len(self.PROMPT) + 1)
                 data += chunk
 
                 # Exit early if prompt marker detected
-                if self.PROMPT in data:
+                if data.find(self.PROMPT, search_from) != -1:
                     break
             else:
                 time.sleep(0.01)  # Short sleep if no data
 
-        return data
+        return bytes(data)
 
     def close(self):
         """Close serial connection."""
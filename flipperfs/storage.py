@@ -1,102 +1,242 @@
 """High-level storage operations for Flipper Zero filesystem."""
 
-import re
+import hashlib
+import io
+import os
+import tarfile
 import time
+from contextlib import closing
 import logging
-from typing import List, Dict, Optional, Union
+from typing import BinaryIO, Callable, Iterator, List, Dict, Optional, Tuple, Union
+from . import parsers
+from .backup import BackupRepository
+from .entry import DirEntry
+from .capabilities import DeviceCapabilities, probe_capabilities
 from .serial_cli import SerialCLI
-from .exceptions import FileNotFoundError, WriteError, FlipperFilesystemError
+from .utils import encode_text_lines, normalize_path
+from .file import FlipperFileReader, FlipperFileWriter
+from .exceptions import (
+    FileNotFoundError,
+    WriteError,
+    ReadError,
+    FlipperFilesystemError,
+)
 
 
 class FlipperStorage:
     """Flipper Zero filesystem operations via serial CLI."""
 
-    def __init__(self, port: str = "/dev/ttyACM0", baud_rate: int = None):
-        """Initialize storage operations."""
-        self.cli = SerialCLI(port, baud_rate)
+    # Chunk writes sent per pipelined batch by write_many
+    WRITE_BATCH = 64
+
+    def __init__(
+        self,
+        port: str = "/dev/ttyACM0",
+        baud_rate: int = None,
+        transport=None,
+        record_path: str = None,
+        probe: bool = False,
+        cache_dir: str = None,
+    ):
+        """Initialize storage operations.
+
+        With probe=True, firmware capabilities are probed (or loaded from the
+        cache in cache_dir) so operations pick the fastest supported path.
+        """
+        self.cli = SerialCLI(port, baud_rate, transport, record_path)
         self.logger = logging.getLogger(__name__)
+        self.capabilities = DeviceCapabilities()
+        if probe:
+            self.probe_capabilities(cache_dir)
+
+    def probe_capabilities(
+        self, cache_dir: str = None, refresh: bool = False
+    ) -> DeviceCapabilities:
+        """Probe firmware capabilities, reusing the on-disk cache if possible."""
+        self.capabilities = probe_capabilities(self.cli, cache_dir, refresh)
+        return self.capabilities
 
     def info(self, path: str = "/any") -> Dict[str, str]:
         """Get filesystem information."""
-        response = self.cli.send_command(f"storage info {path}")
-
-        # Parse response
-        info = {}
-        for line in response.split("\n"):
-            if ":" in line and not line.startswith(">"):
-                key, value = line.split(":", 1)
-                info[key.strip()] = value.strip()
-
-        return info
+        command = f"storage info {path}"
+        response = self.cli.send_command_raw(command)
+        return parsers.parse_key_values(parsers.strip_response(response, command))
 
     def list(self, path: str = "/any") -> List[Dict[str, Union[str, int]]]:
         """List files and directories."""
-        response = self.cli.send_command(f"storage list {path}")
+        response = self.cli.send_command_raw(f"storage list {path}")
 
         entries = []
-        for line in response.split("\n"):
-            line = line.strip()
-            if line.startswith("[F]"):  # File
-                parts = line.split()
-                if len(parts) >= 3:
-                    name = parts[1]
-                    size_str = parts[2] if len(parts) > 2 else "0b"
-                    size = int(size_str.rstrip("b"))
-                    entries.append(
-                        {
-                            "type": "file",
-                            "name": name,
-                            "size": size,
-                            "path": f"{path}/{name}",
-                        }
-                    )
-            elif line.startswith("[D]"):  # Directory
-                parts = line.split()
-                if len(parts) >= 2:
-                    name = parts[1]
-                    entries.append(
-                        {"type": "directory", "name": name, "path": f"{path}/{name}"}
-                    )
+        for entry_type, name, size in parsers.parse_entries(response):
+            entry = {"type": entry_type, "name": name}
+            if entry_type == "file":
+                entry["size"] = size
+            entry["path"] = f"{path}/{name}"
+            entries.append(entry)
 
         return entries
 
+    def iterdir(
+        self, path: str = "/any", entry_type: str = None, suffix: str = None
+    ) -> Iterator[DirEntry]:
+        """Stream directory entries as the listing arrives.
+
+        Entries are parsed line by line and can be filtered by type
+        ("file" or "directory") and name suffix without being built. The
+        listing occupies the link until exhausted or closed, so no other
+        command may be sent while iterating.
+        """
+        chunks = self.cli.stream_command(f"storage list {path}")
+        pending = b""
+        finished = False
+
+        try:
+            for chunk in chunks:
+                data = pending + chunk
+                end = data.rfind(b"\n") + 1
+                lines, pending = data[:end], data[end:]
+                for kind, name, size in parsers.parse_entries(
+                    lines, entry_type, suffix
+                ):
+                    yield DirEntry(path, name, kind, size)
+
+                # The prompt is the only line without a trailing newline
+                if parsers.PROMPT in pending:
+                    finished = True
+                    break
+        finally:
+            # Drain the rest of the listing if the consumer stopped early
+            if not finished:
+                for chunk in chunks:
+                    pending = pending[-len(parsers.PROMPT) :] + chunk
+                    if parsers.PROMPT in pending:
+                        break
+
     def read(self, file_path: str) -> str:
         """Read file content as string."""
-        response = self.cli.send_command(f"storage read {file_path}", timeout=5)
+        response = self.cli.send_command_raw(f"storage read {file_path}", timeout=5)
 
-        # Check if file exists
-        if "Size:" not in response:
+        content = parsers.parse_read(response)
+        if content is None:
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        # Extract content after size line
-        lines = response.split("\n")
-        content_start = 0
-        for i, line in enumerate(lines):
-            if line.startswith("Size:"):
-                content_start = i + 1
-                break
-
-        # Remove command echo and prompt from content
-        content_lines = []
-        for line in lines[content_start:]:
-            if not line.startswith(">") and ">:" not in line:
-                content_lines.append(line)
+        return content.decode("utf-8", errors="replace")
+
+    def read_to(
+        self,
+        file_path: str,
+        sink: Union[str, BinaryIO],
+        verify: bool = False,
+        retries: int = 1,
+        expected_md5: str = None,
+    ) -> int:
+        """Stream file content into a local path or binary file object.
+
+        Content is written as it arrives, so memory use does not depend on
+        file size. With verify=True, content is hashed in the same pass and
+        checked against the device MD5 (or expected_md5, if already known); a
+        mismatch re-downloads the file if the sink is seekable. Returns the
+        number of bytes written.
+        """
+        if isinstance(sink, str):
+            with open(sink, "wb") as f:
+                return self.read_to(file_path, f, verify, retries, expected_md5)
+
+        seekable = getattr(sink, "seekable", lambda: False)()
+        start = sink.tell() if verify and seekable else None
+
+        def receive(hasher) -> int:
+            written = 0
+            with closing(self._iter_read(file_path)) as chunks:
+                for data in chunks:
+                    sink.write(data)
+                    hasher.update(data)
+                    written += len(data)
+            return written
+
+        def reset():
+            sink.seek(start)
+            sink.truncate()
+
+        # A sink that cannot be rewound cannot be retried
+        if start is None:
+            retries = 0
+        return self._verified_read(
+            file_path, receive, verify, retries, reset, expected_md5
+        )
+
+    def iter_lines(self, file_path: str) -> Iterator[str]:
+        """Yield file lines, without line endings, as they arrive.
+
+        The read occupies the link until exhausted or closed, so no other
+        command may be sent while iterating.
+        """
+        pending = b""
+        with closing(self._iter_read(file_path)) as chunks:
+            for data in chunks:
+                lines = (pending + data).split(b"\n")
+                pending = lines.pop()
+                for line in lines:
+                    yield line.rstrip(b"\r").decode("utf-8", errors="replace")
+
+        if pending:
+            yield pending.rstrip(b"\r").decode("utf-8", errors="replace")
+
+    def _iter_read(self, file_path: str) -> Iterator[bytes]:
+        """Yield content chunks of a `storage read` as they arrive."""
+        stream = parsers.ReadStream()
+        chunks = self.cli.stream_command(f"storage read {file_path}", timeout=5)
+
+        try:
+            for chunk in chunks:
+                data = stream.feed(chunk)
+                if data:
+                    yield data
+                if stream.finished:
+                    break
+        finally:
+            # Drain the rest of the response if the consumer stopped early
+            if not stream.finished:
+                for chunk in chunks:
+                    stream.feed(chunk)
+                    if stream.finished:
+                        break
+
+        if stream.size is None:
+            raise FileNotFoundError(f"File not found: {file_path}")
+        if stream.remaining:
+            raise ReadError(
+                f"Truncated read of {file_path}: {stream.remaining} bytes missing"
+            )
 
-        return "\n".join(content_lines)
+    def write(
+        self, file_path: str, content: str, verify: bool = False, retries: int = 1
+    ) -> bool:
+        """Write content to file.
 
-    def write(self, file_path: str, content: str) -> bool:
-        """Write content to file."""
+        With verify=True, the MD5 of the sent bytes is compared against the
+        device MD5 and the file is rewritten on mismatch.
+        """
         self.logger.info(f"Writing to {file_path}")
+        self._verified_write(
+            file_path, lambda: self._send_text(file_path, content), verify, retries
+        )
+        self.logger.info(f"Successfully wrote {file_path}")
+        return True
+
+    def _send_text(self, file_path: str, content: str) -> str:
+        """Send a text write, returning the MD5 of the bytes sent."""
+        hasher = hashlib.md5()
 
         # Start write command
         self.cli.send_raw(f"storage write {file_path}\r".encode())
         time.sleep(0.01)  # Write command delay
 
         # Send content line by line
-        for line in content.split("\n"):
-            if line:  # Skip empty lines
-                self.cli.send_raw(f"{line}\r\n".encode())
-                time.sleep(0.01)  # Line delay
+        for data in encode_text_lines(content):
+            self.cli.send_raw(data)
+            hasher.update(data)
+            time.sleep(0.01)  # Line delay
 
         # Send Ctrl+C to finish
         self.cli.send_raw(b"\x03")
@@ -104,27 +244,26 @@ class FlipperStorage:
 
         # Read response
         response = self.cli.read_available(timeout=1)
-        decoded = response.decode("utf-8", errors="replace")
 
-        if "Error" in decoded:
-            raise WriteError(f"Failed to write {file_path}: {decoded}")
+        error = parsers.find_error(response)
+        if error:
+            raise WriteError(f"Failed to write {file_path}: {error}")
 
-        self.logger.info(f"Successfully wrote {file_path}")
-        return True
+        return hasher.hexdigest()
 
     def stat(self, path: str) -> Optional[Dict[str, Union[str, int]]]:
         """Get file or directory statistics."""
-        response = self.cli.send_command(f"storage stat {path}")
+        command = f"storage stat {path}"
+        response = self.cli.send_command_raw(command)
 
-        if "File, size:" in response:
-            # Parse file stats
-            size_str = response.split("size:")[1].split()[0]
-            size = int(size_str.rstrip("b"))
-            return {"type": "file", "size": size, "path": path}
-        elif "Dir" in response:
-            return {"type": "directory", "path": path}
+        stats = parsers.parse_stat(parsers.strip_response(response, command))
+        if stats is None:
+            return None
 
-        return None
+        entry_type, size = stats
+        if entry_type == "file":
+            return {"type": "file", "size": size, "path": path}
+        return {"type": "directory", "path": path}
 
     def exists(self, path: str) -> bool:
         """Check if file or directory exists."""
@@ -132,60 +271,121 @@ class FlipperStorage:
 
     def remove(self, path: str) -> bool:
         """Remove file or directory."""
-        response = self.cli.send_command(f"storage remove {path}")
+        command = f"storage remove {path}"
+        response = self.cli.send_command_raw(command)
 
-        if "Error" in response:
-            raise FlipperFilesystemError(f"Failed to remove {path}: {response}")
+        error = parsers.find_error(parsers.strip_response(response, command))
+        if error:
+            raise FlipperFilesystemError(f"Failed to remove {path}: {error}")
 
         return True
 
     def mkdir(self, path: str) -> bool:
         """Create directory."""
-        response = self.cli.send_command(f"storage mkdir {path}")
+        command = f"storage mkdir {path}"
+        response = self.cli.send_command_raw(command)
 
-        if "Error" in response:
-            raise FlipperFilesystemError(
-                f"Failed to create directory {path}: {response}"
-            )
+        error = parsers.find_error(parsers.strip_response(response, command))
+        if error:
+            raise FlipperFilesystemError(f"Failed to create directory {path}: {error}")
 
         return True
 
-    def read_binary(self, file_path: str, chunk_size: int = 1024) -> bytes:
-        """Read binary file using chunk operations."""
-        content = b""
+    def read_chunk(self, file_path: str, offset: int, size: int) -> bytes:
+        """Read up to size bytes of a binary file starting at offset.
+
+        Ranged reads need firmware whose read_chunks takes an offset (see
+        probe_capabilities). Otherwise the file is streamed from the start
+        and sliced, which transfers the whole file.
+        """
+        if self.capabilities.chunk_offsets:
+            response = self.cli.send_command_raw(
+                f"storage read_chunks {file_path} {size} {offset}", timeout=5
+            )
+            return parsers.parse_hex_data(response) or b""
+
+        chunks = []
+        position = 0
+        with closing(self._iter_read(file_path)) as stream:
+            for data in stream:
+                end = position + len(data)
+                if end > offset:
+                    chunks.append(data[max(0, offset - position) :])
+                position = end
+                if position >= offset + size:
+                    break
+        return b"".join(chunks)[:size]
+
+    def read_binary(
+        self,
+        file_path: str,
+        chunk_size: int = 1024,
+        verify: bool = False,
+        retries: int = 1,
+    ) -> bytes:
+        """Read binary file using chunk operations.
+
+        Falls back to a single streamed `storage read` on firmware without
+        ranged read_chunks. With verify=True, chunks are hashed as they arrive and
+        checked against the device MD5; a mismatch re-reads the file.
+        """
+
+        return self._verified_read(
+            file_path,
+            lambda hasher: self._read_chunks(file_path, chunk_size, hasher),
+            verify,
+            retries,
+        )
+
+    def _read_chunks(self, file_path: str, chunk_size: int, hasher) -> bytes:
+        """Read whole binary file, hashing chunks as they arrive."""
+        chunks = []
+
+        if not self.capabilities.chunk_offsets:
+            # Size-driven streaming, content may contain the prompt marker
+            with closing(self._iter_read(file_path)) as stream:
+                for chunk in stream:
+                    hasher.update(chunk)
+                    chunks.append(chunk)
+            return b"".join(chunks)
+
         offset = 0
 
         while True:
-            response = self.cli.send_command(
-                f"storage read_chunks {file_path} {chunk_size}", timeout=5
-            )
+            chunk = self.read_chunk(file_path, offset, chunk_size)
+            hasher.update(chunk)
+            chunks.append(chunk)
 
-            # Parse response for binary data
-            if "Size:" in response:
-                # Extract hex data and convert to bytes
-                hex_lines = []
-                for line in response.split("\n"):
-                    # Look for hex data patterns
-                    if re.match(r"^[0-9A-Fa-f\s]+$", line.strip()):
-                        hex_lines.append(line.strip())
-
-                if hex_lines:
-                    hex_data = "".join(hex_lines).replace(" ", "")
-                    chunk = bytes.fromhex(hex_data)
-                    content += chunk
-
-                    if len(chunk) < chunk_size:
-                        break  # End of file
-                    offset += chunk_size
-                else:
-                    break
-            else:
-                break
+            if len(chunk) < chunk_size:
+                break  # End of file
+            offset += chunk_size
 
-        return content
+        return b"".join(chunks)
+
+    def write_binary(
+        self,
+        file_path: str,
+        data: bytes,
+        chunk_size: int = 1024,
+        verify: bool = False,
+        retries: int = 1,
+    ) -> bool:
+        """Write binary file using chunk operations.
+
+        With verify=True, chunks are hashed as they are sent and checked
+        against the device MD5; a mismatch rewrites the file.
+        """
+        self._verified_write(
+            file_path,
+            lambda: self._send_chunks(file_path, data, chunk_size),
+            verify,
+            retries,
+        )
+        return True
 
-    def write_binary(self, file_path: str, data: bytes, chunk_size: int = 1024) -> bool:
-        """Write binary file using chunk operations."""
+    def _send_chunks(self, file_path: str, data: bytes, chunk_size: int) -> str:
+        """Send data as write_chunk commands, returning its MD5."""
+        hasher = hashlib.md5()
         offset = 0
         total_size = len(data)
 
@@ -210,53 +410,428 @@ class FlipperStorage:
             time.sleep(0.3)
 
             response = self.cli.read_available()
-            if b"Error" in response:
-                raise WriteError(f"Failed to write chunk at offset {offset}")
+            error = parsers.find_error(response)
+            if error:
+                raise WriteError(
+                    f"Failed to write chunk at offset {offset} of {file_path}: {error}"
+                )
 
+            hasher.update(chunk)
             offset += chunk_size
 
+        return hasher.hexdigest()
+
+    def _verified_write(
+        self, file_path: str, send: Callable[[], str], verify: bool, retries: int
+    ):
+        """Run send, rewriting the file until its device MD5 matches."""
+        for attempt in range(1, retries + 2):
+            local_md5 = send()
+            if not verify:
+                return
+            device_md5 = self.md5(file_path)
+            if device_md5 == local_md5:
+                return
+            self.logger.warning(
+                f"MD5 mismatch writing {file_path} (attempt {attempt}): "
+                f"local {local_md5}, device {device_md5}"
+            )
+            if attempt <= retries:
+                # Writes append, start over from an empty file
+                self.remove(file_path)
+
+        raise WriteError(
+            f"Verification failed for {file_path} after {attempt} attempts: "
+            f"local MD5 {local_md5}, device MD5 {device_md5}"
+        )
+
+    def _verified_read(
+        self,
+        file_path: str,
+        receive: Callable,
+        verify: bool,
+        retries: int,
+        reset: Callable[[], None] = None,
+        expected_md5: str = None,
+    ):
+        """Run receive with a hasher, re-reading until the device MD5 matches.
+
+        reset is called before each retry to discard what was received.
+        """
+        for attempt in range(1, retries + 2):
+            hasher = hashlib.md5()
+            result = receive(hasher)
+            if not verify:
+                return result
+            local_md5 = hasher.hexdigest()
+            device_md5 = expected_md5 or self.md5(file_path)
+            if device_md5 == local_md5:
+                return result
+            self.logger.warning(
+                f"MD5 mismatch reading {file_path} (attempt {attempt}): "
+                f"local {local_md5}, device {device_md5}"
+            )
+            if attempt > retries:
+                break
+            if reset:
+                reset()
+
+        raise ReadError(
+            f"Verification failed for {file_path} after {attempt} attempts: "
+            f"local MD5 {local_md5}, device MD5 {device_md5}"
+        )
+
+    def open(
+        self,
+        file_path: str,
+        mode: str = "rb",
+        chunk_size: int = 1024,
+        read_ahead: int = 4,
+        cache_chunks: int = 8,
+    ) -> Union[io.BufferedReader, io.BufferedWriter]:
+        """Open binary file for seekable reading or buffered writing.
+
+        Modes are "rb", "wb" and "ab". Reads fetch chunks on demand with a
+        sequential read-ahead window, writes are buffered into chunk_size
+        write_chunk commands.
+        """
+        if mode == "rb":
+            raw = FlipperFileReader(
+                self, file_path, chunk_size, read_ahead, cache_chunks
+            )
+            return io.BufferedReader(raw, buffer_size=chunk_size)
+        elif mode in ("wb", "ab"):
+            raw = FlipperFileWriter(self, file_path, chunk_size, append=mode == "ab")
+            return io.BufferedWriter(raw, buffer_size=chunk_size)
+
+        raise ValueError(f"Unsupported mode: {mode!r}")
+
+    def upload_bundle(self, local_dir: str, remote_dir: str) -> bool:
+        """Upload a local directory tree of small files in bulk.
+
+        On firmware with `storage extract` (see probe_capabilities), the files
+        are packed into a tar, streamed with chunked writes and extracted on
+        the device. Otherwise files are written with pipelined chunk writes.
+        Either way, the result is verified against the local sizes.
+        """
+        remote_dir = normalize_path(remote_dir)
+        files = {}
+        for root, _, names in os.walk(local_dir):
+            for name in sorted(names):
+                local_path = os.path.join(root, name)
+                relative = os.path.relpath(local_path, local_dir).replace(os.sep, "/")
+                files[relative] = local_path
+
+        if "extract" in self.capabilities.storage_commands:
+            self._upload_archive(files, remote_dir)
+        else:
+            self._upload_files(files, remote_dir)
+
+        # Verify every file landed with the expected size
+        remote = {path: size for _, path, size in self.walk(remote_dir)}
+        mismatches = [
+            relative
+            for relative, local_path in files.items()
+            if remote.get(f"{remote_dir}/{relative}") != os.path.getsize(local_path)
+        ]
+        if mismatches:
+            raise WriteError(
+                f"Bundle upload to {remote_dir} failed for {len(mismatches)} "
+                f"file(s): {', '.join(mismatches[:10])}"
+            )
+
+        return True
+
+    def _upload_archive(self, files: Dict[str, str], remote_dir: str):
+        """Pack files into a tar, upload it and extract it on the device."""
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w", format=tarfile.USTAR_FORMAT) as tar:
+            for relative, local_path in files.items():
+                tar.add(local_path, arcname=relative, recursive=False)
+
+        if not self.exists(remote_dir):
+            self.mkdir(remote_dir)
+
+        archive = f"{remote_dir}/.bundle_{time.time_ns()}.tar"
+        self.write_many({archive: buffer.getvalue()})
+        try:
+            self._run_commands(
+                [f"storage extract {archive} {remote_dir}"],
+                f"extract {archive}",
+            )
+        finally:
+            self.remove(archive)
+
+    def _upload_files(self, files: Dict[str, str], remote_dir: str):
+        """Write files one by one, with pipelined commands and no fixed sleeps."""
+        existing = {}
+        if self.exists(remote_dir):
+            existing = {path: kind for kind, path, _ in self.walk(remote_dir)}
+        else:
+            self.mkdir(remote_dir)
+
+        # Missing directories parents first, then remove files chunk writes append to
+        directories = set()
+        for relative in files:
+            parts = relative.split("/")[:-1]
+            for i in range(1, len(parts) + 1):
+                directories.add(f"{remote_dir}/{'/'.join(parts[:i])}")
+        commands = [
+            f"storage mkdir {directory}"
+            for directory in sorted(directories, key=lambda p: p.count("/"))
+            if directory not in existing
+        ]
+        commands.extend(
+            f"storage remove {remote_dir}/{relative}"
+            for relative in files
+            if existing.get(f"{remote_dir}/{relative}") == "file"
+        )
+        if commands:
+            self._run_commands(commands, f"prepare {remote_dir}")
+
+        self.write_many(
+            {
+                f"{remote_dir}/{relative}": local_path
+                for relative, local_path in files.items()
+            }
+        )
+
+    def write_many(
+        self,
+        sources: Dict[str, Union[bytes, str]],
+        chunk_size: int = 1024,
+        window: int = 2,
+    ) -> bool:
+        """Write several files with pipelined write_chunk commands.
+
+        Sources map remote paths to content or to local file paths. Local
+        files are read chunk by chunk and commands are sent in batches of
+        WRITE_BATCH, so memory use does not depend on the total size. Chunk
+        writes append, so existing files should be removed first.
+        """
+        batch = []
+        for target, payload in self._write_payloads(sources, chunk_size):
+            batch.append((target, payload))
+            if len(batch) >= self.WRITE_BATCH:
+                self._send_writes(batch, window)
+                batch = []
+        if batch:
+            self._send_writes(batch, window)
         return True
 
+    def _write_payloads(
+        self, sources: Dict[str, Union[bytes, str]], chunk_size: int
+    ) -> Iterator[Tuple[str, bytes]]:
+        """Yield (remote path, payload) of every chunk write, lazily."""
+        for file_path, source in sources.items():
+            if isinstance(source, str):
+                with open(source, "rb") as f:
+                    chunks = iter(lambda: f.read(chunk_size), b"")
+                    yield from self._chunk_payloads(file_path, chunks)
+            else:
+                chunks = (
+                    source[offset : offset + chunk_size]
+                    for offset in range(0, len(source), chunk_size)
+                )
+                yield from self._chunk_payloads(file_path, chunks)
+
+    @staticmethod
+    def _chunk_payloads(
+        file_path: str, chunks: Iterator[bytes]
+    ) -> Iterator[Tuple[str, bytes]]:
+        """Yield write_chunk payloads, or an empty write for no chunks."""
+        empty = True
+        for chunk in chunks:
+            empty = False
+            hex_data = chunk.hex()
+            lines = "".join(
+                f"{hex_data[i : i + 64]}\r" for i in range(0, len(hex_data), 64)
+            )
+            yield (
+                file_path,
+                f"storage write_chunk {file_path} {len(chunk)}\r{lines}".encode()
+                + b"\x03",
+            )
+        if empty:
+            # Create empty file
+            yield file_path, f"storage write {file_path}\r".encode() + b"\x03"
+
+    def _send_writes(self, batch: List[Tuple[str, bytes]], window: int):
+        """Send a batch of pipelined write payloads, raising on errors."""
+        responses = self.cli.send_pipelined([p for _, p in batch], window=window)
+        for (file_path, _), response in zip(batch, responses):
+            error = parsers.find_error(response)
+            if error:
+                raise WriteError(f"Failed to write {file_path}: {error}")
+        if len(responses) < len(batch):
+            raise WriteError(
+                f"Timed out after {len(responses)}/{len(batch)} chunk writes"
+            )
+
     def copy(self, source: str, destination: str) -> bool:
         """Copy file to new location."""
-        response = self.cli.send_command(f"storage copy {source} {destination}")
+        command = f"storage copy {source} {destination}"
+        response = self.cli.send_command_raw(command)
 
-        if "Error" in response:
-            raise FlipperFilesystemError(f"Failed to copy {source} to {destination}")
+        error = parsers.find_error(parsers.strip_response(response, command))
+        if error:
+            raise FlipperFilesystemError(
+                f"Failed to copy {source} to {destination}: {error}"
+            )
 
         return True
 
     def rename(self, old_path: str, new_path: str) -> bool:
         """Rename or move file."""
-        response = self.cli.send_command(f"storage rename {old_path} {new_path}")
+        command = f"storage rename {old_path} {new_path}"
+        response = self.cli.send_command_raw(command)
 
-        if "Error" in response:
-            raise FlipperFilesystemError(f"Failed to rename {old_path} to {new_path}")
+        error = parsers.find_error(parsers.strip_response(response, command))
+        if error:
+            raise FlipperFilesystemError(
+                f"Failed to rename {old_path} to {new_path}: {error}"
+            )
 
         return True
 
     def md5(self, file_path: str) -> str:
         """Calculate MD5 hash of file."""
-        response = self.cli.send_command(f"storage md5 {file_path}")
+        response = self.cli.send_command_raw(f"storage md5 {file_path}")
 
-        # Extract MD5 hash from response
-        for line in response.split("\n"):
-            if re.match(r"^[0-9a-f]{32}$", line.strip()):
-                return line.strip()
+        md5 = parsers.parse_md5(response)
+        if md5 is None:
+            raise FlipperFilesystemError(f"Failed to get MD5 for {file_path}")
 
-        raise FlipperFilesystemError(f"Failed to get MD5 for {file_path}")
+        return md5
 
     def tree(self, path: str = "/any") -> str:
         """Get recursive directory listing."""
-        response = self.cli.send_command(f"storage tree {path}", timeout=10)
+        command = f"storage tree {path}"
+        response = self.cli.send_command_raw(command, timeout=10)
+
+        body = parsers.strip_response(response, command)
+        text = body.decode("utf-8", errors="replace")
+        return "\n".join(line for line in text.splitlines() if line.strip())
+
+    def copytree(self, source: str, destination: str) -> bool:
+        """Recursively copy a directory on the device.
+
+        The copy is planned from a single tree listing and runs as pipelined
+        device-side mkdir/copy commands, so file data never crosses the link.
+        """
+        source = normalize_path(source)
+        destination = normalize_path(destination)
+        entries = self.walk(source)
+
+        commands = [f"storage mkdir {destination}"]
+        for entry_type, path, _ in entries:
+            target = destination + path[len(source) :]
+            if entry_type == "directory":
+                commands.append(f"storage mkdir {target}")
+        for entry_type, path, _ in entries:
+            target = destination + path[len(source) :]
+            if entry_type == "file":
+                commands.append(f"storage copy {path} {target}")
+
+        self._run_commands(commands, f"copy {source} to {destination}")
+        return True
 
-        # Clean up response
-        lines = []
-        for line in response.split("\n"):
-            if not line.startswith(">") and line.strip():
-                lines.append(line)
+    def rmtree(self, path: str) -> bool:
+        """Recursively remove a directory on the device.
+
+        Files are removed first, then directories deepest first, as pipelined
+        commands planned from a single tree listing.
+        """
+        path = normalize_path(path)
+        entries = self.walk(path)
+
+        files = [p for entry_type, p, _ in entries if entry_type == "file"]
+        directories = [p for entry_type, p, _ in entries if entry_type == "directory"]
+        directories.sort(key=lambda p: p.count("/"), reverse=True)
+
+        commands = [f"storage remove {p}" for p in files + directories + [path]]
+        self._run_commands(commands, f"remove {path}")
+        return True
 
-        return "\n".join(lines)
+    def movetree(self, source: str, destination: str) -> bool:
+        """Move a directory on the device.
+
+        A single rename is tried first. If it fails (e.g. across storages),
+        the tree is copied and the source removed, still device-side.
+        """
+        try:
+            return self.rename(source, destination)
+        except FlipperFilesystemError as e:
+            self.logger.info(f"Rename failed ({e}), falling back to copy and remove")
+
+        self.copytree(source, destination)
+        return self.rmtree(source)
+
+    def backup(self, remote_root: str, repo_dir: str, name: str = None) -> str:
+        """Snapshot remote_root into a content-addressed repository.
+
+        Only content the repository does not already hold is downloaded.
+        Returns the snapshot name.
+        """
+        return BackupRepository(repo_dir).backup(self, remote_root, name)
+
+    def restore(
+        self, repo_dir: str, snapshot: str = None, remote_root: str = None
+    ) -> List[str]:
+        """Restore a snapshot (the latest by default), pushing only differences."""
+        return BackupRepository(repo_dir).restore(self, snapshot, remote_root)
+
+    def walk(self, path: str) -> List[Tuple[str, str, Optional[int]]]:
+        """Return (type, full path, size) of every entry below path.
+
+        Uses a single `storage tree` listing, or one `storage list` per
+        directory on firmware without tree.
+        """
+        if not self.capabilities.supports("tree"):
+            if self.stat(path) is None:
+                raise FileNotFoundError(f"Failed to list {path}: not found")
+            return self._list_entries(path)
+
+        command = f"storage tree {path}"
+        response = self.cli.send_command_raw(command, timeout=10)
+        body = parsers.strip_response(response, command)
+
+        error = parsers.find_error(body)
+        if error:
+            raise FileNotFoundError(f"Failed to list {path}: {error}")
+
+        prefix = path.rstrip("/") + "/"
+        return [
+            entry
+            for entry in parsers.parse_entries(body)
+            if entry[1].startswith(prefix)
+        ]
+
+    def _list_entries(self, path: str) -> List[Tuple[str, str, Optional[int]]]:
+        """Walk path with one `storage list` per directory, depth first."""
+        entries = []
+        for entry in self.list(path):
+            entries.append((entry["type"], entry["path"], entry.get("size")))
+            if entry["type"] == "directory":
+                entries.extend(self._list_entries(entry["path"]))
+        return entries
+
+    def _run_commands(self, commands: List[str], description: str):
+        """Run pipelined commands, raising on the first reported error."""
+        responses = self.cli.send_commands(commands)
+
+        for command, response in zip(commands, responses):
+            error = parsers.find_error(parsers.strip_response(response, command))
+            if error:
+                raise FlipperFilesystemError(
+                    f"Failed to {description}: {command}: {error}"
+                )
+
+        if len(responses) < len(commands):
+            raise FlipperFilesystemError(
+                f"Failed to {description}: timed out after "
+                f"{len(responses)}/{len(commands)} commands"
+            )
 
     def close(self):
         """Close connection."""
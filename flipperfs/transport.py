@@ -0,0 +1,171 @@
+"""Record-and-replay transports for serial sessions.
+
+A RecordingTransport wraps an open serial object and stores every byte in
+each direction with its timestamp. A ReplayTransport plays such a recording
+back behind the same interface, so a FlipperStorage can run offline for
+profiling and regression tests.
+"""
+
+import struct
+import time
+import logging
+from typing import BinaryIO, List, Tuple
+from .exceptions import ConnectionError
+
+MAGIC = b"FFSR\x01"
+WRITE = b"w"
+READ = b"r"
+
+# direction, seconds since start of session, payload length
+_RECORD = struct.Struct("<cdI")
+
+
+def load_recording(path: str) -> List[Tuple[bytes, float, bytes]]:
+    """Load (direction, timestamp, data) events from a recording file."""
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"Not a session recording: {path}")
+
+        events = []
+        while True:
+            header = f.read(_RECORD.size)
+            if len(header) < _RECORD.size:
+                break
+            direction, timestamp, length = _RECORD.unpack(header)
+            events.append((direction, timestamp, f.read(length)))
+
+    return events
+
+
+class RecordingTransport:
+    """Serial wrapper recording all traffic to a file."""
+
+    def __init__(self, serial, path: str):
+        """Wrap an open serial object, recording to path."""
+        self.serial = serial
+        self.path = path
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(MAGIC)
+        self._start = time.monotonic()
+
+    def _record(self, direction: bytes, data: bytes):
+        timestamp = time.monotonic() - self._start
+        self._file.write(_RECORD.pack(direction, timestamp, len(data)))
+        self._file.write(data)
+
+    def write(self, data: bytes) -> int:
+        self._record(WRITE, bytes(data))
+        return self.serial.write(data)
+
+    def read(self, size: int = 1) -> bytes:
+        data = self.serial.read(size)
+        if data:
+            self._record(READ, data)
+        return data
+
+    @property
+    def in_waiting(self) -> int:
+        return self.serial.in_waiting
+
+    @property
+    def is_open(self) -> bool:
+        return self.serial.is_open
+
+    def flush(self):
+        self.serial.flush()
+        self._file.flush()
+
+    def reset_input_buffer(self):
+        self.serial.reset_input_buffer()
+
+    def reset_output_buffer(self):
+        self.serial.reset_output_buffer()
+
+    def close(self):
+        self.serial.close()
+        if not self._file.closed:
+            self._file.close()
+
+
+class ReplayTransport:
+    """Serial stand-in playing back a recorded session.
+
+    With speed=1.0 responses arrive with their recorded delays, larger
+    values accelerate playback and speed=None removes all delays. Delays
+    are measured from the last write, so host-side processing time is not
+    replayed. With strict=True, writes must match the recording.
+    """
+
+    def __init__(self, path: str, speed: float = None, strict: bool = False):
+        """Load recording from path."""
+        self.path = path
+        self.speed = speed
+        self.strict = strict
+        self.is_open = True
+        self.logger = logging.getLogger(__name__)
+        self._events = load_recording(path)
+        self._index = 0
+        self._pending = b""
+        self._anchor = (time.monotonic(), 0.0)
+
+    def write(self, data: bytes) -> int:
+        """Consume the next recorded write, discarding unread responses."""
+        self._pending = b""
+        while self._index < len(self._events):
+            direction, timestamp, recorded = self._events[self._index]
+            self._index += 1
+            if direction == WRITE:
+                if recorded != bytes(data):
+                    if self.strict:
+                        raise ConnectionError(
+                            f"Replay mismatch: expected {recorded!r}, got {data!r}"
+                        )
+                    self.logger.warning(f"Replay mismatch: {data!r} != {recorded!r}")
+                self._anchor = (time.monotonic(), timestamp)
+                break
+        return len(data)
+
+    def _next_read(self, wait: bool) -> bytes:
+        """Return data of the next recorded read once it is due."""
+        if self._pending:
+            return self._pending
+        if self._index >= len(self._events):
+            return b""
+
+        direction, timestamp, recorded = self._events[self._index]
+        if direction != READ:
+            return b""  # Device is waiting for the next write
+
+        if self.speed:
+            anchor_time, anchor_timestamp = self._anchor
+            due = anchor_time + (timestamp - anchor_timestamp) / self.speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                if not wait:
+                    return b""
+                time.sleep(delay)
+
+        self._index += 1
+        self._pending = recorded
+        return recorded
+
+    def read(self, size: int = 1) -> bytes:
+        data = self._next_read(wait=True)
+        chunk, self._pending = data[:size], data[size:]
+        return chunk
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self._next_read(wait=False))
+
+    def flush(self):
+        pass
+
+    def reset_input_buffer(self):
+        pass
+
+    def reset_output_buffer(self):
+        pass
+
+    def close(self):
+        self.is_open = False
@@ -1,6 +1,7 @@
 """Utility functions for Flipper filesystem operations."""
 
 import re
+from typing import Iterator
 
 
 def normalize_path(path: str) -> str:
@@ -19,6 +20,16 @@ def normalize_path(path: str) -> str:
     return path
 
 
+def encode_text_lines(content: str) -> Iterator[bytes]:
+    """Yield lines of content as sent by a text write, CRLF terminated.
+
+    Empty lines are skipped, like `storage write` input.
+    """
+    for line in content.split("\n"):
+        if line:
+            yield f"{line}\r\n".encode()
+
+
 def parse_size(size_str: str) -> int:
     """Parse size string like '158b' to integer bytes."""
     if size_str.endswith("b"):
@@ -0,0 +1,27 @@
+"""Shared fixtures for storage tests without a device."""
+
+from unittest.mock import MagicMock, patch
+import pytest
+from flipperfs.extras.subghz import SubGhzStorage
+from flipperfs.storage import FlipperStorage
+
+
+@pytest.fixture
+def serial_conn():
+    """Open mock connection returned by serial.Serial."""
+    with patch("flipperfs.serial_cli.serial.Serial") as mock_serial:
+        mock_conn = MagicMock()
+        mock_conn.is_open = True
+        mock_conn.in_waiting = 4096
+        mock_serial.return_value = mock_conn
+        yield mock_conn
+
+
+@pytest.fixture
+def storage(serial_conn):
+    return FlipperStorage("/dev/test")
+
+
+@pytest.fixture
+def subghz(serial_conn):
+    return SubGhzStorage("/dev/test")
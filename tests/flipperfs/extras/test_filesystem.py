@@ -0,0 +1,196 @@
+"""Test suite for flipperfs.extras.filesystem module."""
+
+from unittest.mock import patch
+import pytest
+
+pytest.importorskip("fsspec")
+
+from flipperfs.capabilities import DeviceCapabilities  # noqa: E402
+from flipperfs.extras.filesystem import FlipperFileSystem  # noqa: E402
+
+
+class TestFlipperFileSystem:
+    """Test FlipperFileSystem class."""
+
+    @pytest.fixture
+    def fs(self, storage):
+        storage.capabilities = DeviceCapabilities(chunk_offsets=True)
+        return FlipperFileSystem(storage=storage, skip_instance_cache=True)
+
+    @pytest.fixture
+    def device(self, fs):
+        """Serve stat, list and chunk reads from a dict of path to content."""
+        files = {"/ext/a.txt": b"hello world", "/ext/dir/b.bin": bytes(range(256)) * 40}
+
+        def stat(path):
+            if path in files:
+                return {"type": "file", "size": len(files[path]), "path": path}
+            if any(name.startswith(path + "/") for name in files):
+                return {"type": "directory", "path": path}
+            return None
+
+        def list_entries(path):
+            entries = {}
+            for name, data in files.items():
+                if name.startswith(path + "/"):
+                    child = name[len(path) + 1 :].split("/")[0]
+                    if "/" in name[len(path) + 1 :]:
+                        entries[child] = {"type": "directory", "name": child}
+                    else:
+                        entries[child] = {
+                            "type": "file",
+                            "name": child,
+                            "size": len(data),
+                        }
+            return list(entries.values())
+
+        with (
+            patch.object(fs.storage, "stat", side_effect=stat),
+            patch.object(fs.storage, "list", side_effect=list_entries),
+            patch.object(
+                fs.storage,
+                "read_chunk",
+                side_effect=lambda path, offset, size: files[path][
+                    offset : offset + size
+                ],
+            ),
+        ):
+            yield files
+
+    def test_ls_caches_listing(self, fs):
+        listing = [
+            {"type": "file", "name": "a.sub", "size": 10, "path": "/ext/a.sub"},
+            {"type": "directory", "name": "dir", "path": "/ext/dir"},
+        ]
+        with (
+            patch.object(fs.storage, "stat", return_value={"type": "directory"}),
+            patch.object(fs.storage, "list", return_value=listing) as mock_list,
+        ):
+            entries = fs.ls("flipper:///ext/")
+            names = fs.ls("/ext", detail=False)
+            info = fs.info("/ext/a.sub")
+
+        assert entries[0] == {"name": "/ext/a.sub", "size": 10, "type": "file"}
+        assert entries[1]["type"] == "directory"
+        assert names == ["/ext/a.sub", "/ext/dir"]
+        assert info["size"] == 10
+        mock_list.assert_called_once_with("/ext")
+
+    def test_ls_missing_path(self, fs):
+        with patch.object(fs.storage, "stat", return_value=None):
+            with pytest.raises(FileNotFoundError):
+                fs.ls("/ext/missing")
+
+    def test_open_read_uses_block_cache(self, fs):
+        data = bytes(range(256)) * 40  # 10240 bytes
+
+        def read_chunk(path, offset, size):
+            return data[offset : offset + size]
+
+        with (
+            patch.object(
+                fs.storage, "stat", return_value={"type": "file", "size": len(data)}
+            ),
+            patch.object(
+                fs.storage, "read_chunk", side_effect=read_chunk
+            ) as mock_read_chunk,
+        ):
+            with fs.open("/ext/data.bin", "rb") as f:
+                f.seek(5000)
+                assert f.read(10) == data[5000:5010]
+                f.seek(5000)
+                assert f.read(10) == data[5000:5010]
+                f.seek(0)
+                assert f.read(4) == data[:4]
+
+        # One block per distinct region, the repeated read is served from cache
+        assert mock_read_chunk.call_count == 2
+        mock_read_chunk.assert_any_call("/ext/data.bin", 4096, 4096)
+        mock_read_chunk.assert_any_call("/ext/data.bin", 0, 4096)
+
+    def test_read_past_eof(self, fs, device):
+        with fs.open("/ext/a.txt", "rb") as f:
+            assert f.read(100000) == b"hello world"
+            assert f.read(10) == b""
+
+    def test_get(self, fs, device, tmp_path):
+        fs.get("/ext/a.txt", str(tmp_path / "a.txt"))
+        fs.get("/ext/dir/", str(tmp_path / "dir"), recursive=True)
+
+        assert (tmp_path / "a.txt").read_bytes() == b"hello world"
+        assert (tmp_path / "dir" / "b.bin").read_bytes() == device["/ext/dir/b.bin"]
+
+    def test_find(self, fs, device):
+        assert fs.find("/ext") == ["/ext/a.txt", "/ext/dir/b.bin"]
+
+    def test_cat_file_range(self, fs, device):
+        assert fs.cat_file("/ext/a.txt", start=6, end=9) == b"wor"
+        assert fs.cat_file("/ext/dir/b.bin", start=4095, end=4098) == bytes([255, 0, 1])
+
+    def test_put(self, fs, device, tmp_path):
+        local = tmp_path / "up.bin"
+        local.write_bytes(b"uploaded")
+        with (
+            patch.object(fs.storage, "remove"),
+            patch.object(fs.storage, "write_binary") as mock_write_binary,
+        ):
+            fs.put(str(local), "/ext/up.bin")
+
+        mock_write_binary.assert_called_once_with("/ext/up.bin", b"uploaded")
+
+    def test_open_without_ranged_reads_streams_once(self, fs):
+        data = bytes(range(256)) * 40
+        fs.storage.capabilities = DeviceCapabilities()
+        with (
+            patch.object(
+                fs.storage, "stat", return_value={"type": "file", "size": len(data)}
+            ),
+            patch.object(fs.storage, "read_binary", return_value=data) as mock_read,
+            patch.object(fs.storage, "read_chunk") as mock_read_chunk,
+        ):
+            with fs.open("/ext/data.bin", "rb") as f:
+                f.seek(5000)
+                assert f.read(10) == data[5000:5010]
+                f.seek(0)
+                assert f.read() == data
+
+        mock_read.assert_called_once_with("/ext/data.bin")
+        mock_read_chunk.assert_not_called()
+
+    def test_open_write_and_invalidate(self, fs):
+        fs.dircache["/ext"] = []
+        with (
+            patch.object(fs.storage, "exists", return_value=True),
+            patch.object(fs.storage, "remove") as mock_remove,
+            patch.object(fs.storage, "write_binary") as mock_write_binary,
+        ):
+            with fs.open("/ext/out.bin", "wb") as f:
+                f.write(b"hello")
+                f.write(b" world")
+
+        mock_remove.assert_called_once_with("/ext/out.bin")
+        mock_write_binary.assert_called_once_with("/ext/out.bin", b"hello world")
+        assert "/ext" not in fs.dircache
+
+    def test_open_append_keeps_content(self, fs):
+        with (
+            patch.object(fs.storage, "exists", return_value=True),
+            patch.object(fs.storage, "remove") as mock_remove,
+            patch.object(fs.storage, "write_binary") as mock_write_binary,
+        ):
+            with fs.open("/ext/log.bin", "ab") as f:
+                f.write(b"more")
+
+        mock_remove.assert_not_called()
+        mock_write_binary.assert_called_once_with("/ext/log.bin", b"more")
+
+    def test_mv_and_cp_use_device_commands(self, fs):
+        with (
+            patch.object(fs.storage, "rename") as mock_rename,
+            patch.object(fs.storage, "copy") as mock_copy,
+        ):
+            fs.mv("/ext/a.sub", "/ext/b.sub")
+            fs.cp_file("/ext/b.sub", "/ext/c.sub")
+
+        mock_rename.assert_called_once_with("/ext/a.sub", "/ext/b.sub")
+        mock_copy.assert_called_once_with("/ext/b.sub", "/ext/c.sub")
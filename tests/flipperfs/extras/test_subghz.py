@@ -1,7 +1,19 @@
 """Test suite for flipperfs.extras.subghz module."""
 
+import hashlib
+import io
+from array import array
 from unittest.mock import MagicMock, patch
-from flipperfs.extras.subghz import SubGhzStorage
+import pytest
+from flipperfs.entry import DirEntry
+from flipperfs.utils import create_sub_content, encode_text_lines
+from flipperfs.extras.subghz import (
+    RAW_DATA_KEY,
+    SubGhzStorage,
+    SignalCatalog,
+    encode_raw_data,
+    parse_raw_data,
+)
 
 
 class TestSubGhzStorage:
@@ -13,14 +25,14 @@ class TestSubGhzStorage:
         mock_conn.is_open = True
         mock_serial.return_value = mock_conn
 
-        list_response = """[F] signal1.sub 158b
+        list_response = b"""[F] signal1.sub 158b
 [F] signal2.sub 200b
 [F] readme.txt 50b
 [D] subdir
 >:"""
 
         subghz = SubGhzStorage("/dev/test")
-        with patch.object(subghz.cli, "send_command", return_value=list_response):
+        with patch.object(subghz.cli, "stream_command", return_value=[list_response]):
             signals = subghz.list_signals()
 
         # Should only return .sub files
@@ -40,10 +52,10 @@ Frequency: 433920000
 Protocol: Dooya
 Key: 00 00 00 12 F6 CC 05 3C"""
 
-        read_response = f"Size: 100\n{signal_content}\n>:"
+        read_response = f"Size: 100\n{signal_content}\n>:".encode()
 
         subghz = SubGhzStorage("/dev/test")
-        with patch.object(subghz.cli, "send_command", return_value=read_response):
+        with patch.object(subghz.cli, "send_command_raw", return_value=read_response):
             signal_data = subghz.read_signal("test.sub")
 
         assert signal_data["Filetype"] == "Flipper SubGhz Key File"
@@ -72,3 +84,294 @@ Key: 00 00 00 12 F6 CC 05 3C"""
         content = call_args[0][1]
         assert "Filetype: Flipper SubGhz Key File" in content
         assert "Key: 00 00 00 12 F6 CC 05 3C" in content
+
+
+class TestSignalCatalog:
+    """Test SignalCatalog class."""
+
+    LISTING = [
+        DirEntry("/any/subghz", "a.sub", "file", 10),
+        DirEntry("/any/subghz", "b.sub", "file", 20),
+    ]
+
+    HEADERS = {
+        "/any/subghz/a.sub": {
+            "Frequency": 433920000,
+            "Preset": "FuriHalSubGhzPresetOok650Async",
+            "Protocol": "Dooya",
+            "Bit": 40,
+        },
+        "/any/subghz/b.sub": {
+            "Frequency": 868350000,
+            "Preset": "FuriHalSubGhzPresetOok650Async",
+            "Protocol": "RAW",
+        },
+    }
+
+    def test_read_header_stops_before_payload(self, subghz):
+        content = (
+            b"Filetype: Flipper SubGhz RAW File\nVersion: 1\n"
+            b"Frequency: 433920000\nPreset: FuriHalSubGhzPresetOok650Async\n"
+            b"Protocol: RAW\nRAW_Data: 100 -200 300\n"
+        )
+        payload = b"RAW_Data: 100 -200 300\n" * 50
+        subghz.cli.serial.read.side_effect = [
+            b"storage read /any/subghz/raw.sub\r\n",
+            f"Size: {len(content) + len(payload)}\r\n".encode() + content,
+            payload + b"\r\n>: ",
+        ]
+
+        header = SignalCatalog(subghz)._read_header("/any/subghz/raw.sub")
+
+        assert header == {
+            "Frequency": 433920000,
+            "Preset": "FuriHalSubGhzPresetOok650Async",
+            "Protocol": "RAW",
+        }
+        # One streamed read, drained up to the prompt
+        subghz.cli.serial.write.assert_called_once()
+        assert subghz.cli.serial.read.call_count == 3
+
+    def test_refresh_and_find(self, subghz):
+        catalog = SignalCatalog(subghz)
+        with (
+            patch.object(subghz, "iterdir", return_value=self.LISTING),
+            patch.object(subghz, "md5", side_effect=lambda p: p[-5:]),
+            patch.object(
+                catalog, "_read_header", side_effect=self.HEADERS.get
+            ) as mock_header,
+        ):
+            changes = catalog.refresh()
+
+        assert changes["added"] == ["/any/subghz/a.sub", "/any/subghz/b.sub"]
+        assert mock_header.call_count == 2
+        assert catalog.find(frequency=433920000) == ["/any/subghz/a.sub"]
+        assert catalog.find(protocol="RAW") == ["/any/subghz/b.sub"]
+        assert catalog.find(frequency=433920000, protocol="RAW") == []
+        assert len(catalog.find()) == 2
+
+    def test_refresh_reads_listing_before_other_commands(self, subghz):
+        catalog = SignalCatalog(subghz)
+        listing_open = False
+
+        def iterdir(*args, **kwargs):
+            nonlocal listing_open
+            listing_open = True
+            yield from self.LISTING
+            listing_open = False
+
+        def md5(path):
+            assert not listing_open, "md5 sent while the listing is streaming"
+            return path[-5:]
+
+        with (
+            patch.object(subghz, "iterdir", side_effect=iterdir),
+            patch.object(subghz, "md5", side_effect=md5),
+            patch.object(catalog, "_read_header", side_effect=self.HEADERS.get),
+        ):
+            changes = catalog.refresh()
+
+        assert len(changes["added"]) == 2
+
+    def test_incremental_refresh(self, subghz, tmp_path):
+        index_path = str(tmp_path / "index.json")
+        catalog = SignalCatalog(subghz, index_path=index_path)
+        with (
+            patch.object(subghz, "iterdir", return_value=self.LISTING),
+            patch.object(subghz, "md5", side_effect=lambda p: p[-5:]),
+            patch.object(catalog, "_read_header", side_effect=self.HEADERS.get),
+        ):
+            catalog.refresh()
+
+        # Reload from disk; b.sub changed content, a.sub was deleted
+        catalog = SignalCatalog(subghz, index_path=index_path)
+        listing = [self.LISTING[1]]
+        with (
+            patch.object(subghz, "iterdir", return_value=listing),
+            patch.object(subghz, "md5", return_value="changed"),
+            patch.object(
+                catalog, "_read_header", side_effect=self.HEADERS.get
+            ) as mock_header,
+        ):
+            changes = catalog.refresh()
+
+        assert changes == {
+            "added": [],
+            "updated": ["/any/subghz/b.sub"],
+            "removed": ["/any/subghz/a.sub"],
+        }
+        mock_header.assert_called_once_with("/any/subghz/b.sub")
+
+        # Unchanged size and MD5, nothing is re-read
+        with (
+            patch.object(subghz, "iterdir", return_value=listing),
+            patch.object(subghz, "md5", return_value="changed"),
+            patch.object(catalog, "_read_header") as mock_header,
+        ):
+            changes = catalog.refresh()
+
+        mock_header.assert_not_called()
+        assert changes == {"added": [], "updated": [], "removed": []}
+
+
+class TestTempSignalPool:
+    """Test TempSignalPool class."""
+
+    def test_unique_slots(self, subghz):
+        pool = subghz.temp_signal_pool(size=2)
+        first = pool.acquire()
+        second = pool.acquire()
+
+        assert first != second
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.01)
+
+        pool.release(first)
+        assert pool.acquire() == first
+
+    def test_skip_unchanged_upload(self, subghz):
+        with (
+            patch.object(subghz, "stat", return_value=None) as mock_stat,
+            patch.object(subghz, "remove", return_value=True) as mock_remove,
+            patch.object(subghz, "write", return_value=True) as mock_write,
+        ):
+            pool = subghz.temp_signal_pool(size=1)
+            with pool.signal("00000012F6CC053C") as path:
+                assert path == "/any/subghz/_temp_slot_0.sub"
+            with pool.signal("00000012F6CC053C") as path:
+                pass
+            with pool.signal("00000012F6CC053D") as path:
+                pass
+
+        assert mock_write.call_count == 2
+        assert "Key: 00 00 00 12 F6 CC 05 3D" in mock_write.call_args[0][1]
+        # Writes append: the slot is cleared before different content
+        mock_stat.assert_called_once_with(path)
+        mock_remove.assert_called_once_with(path)
+
+    def test_stale_slot_cleared_before_first_write(self, subghz):
+        with (
+            patch.object(subghz, "stat", return_value={"type": "file", "size": 131}),
+            patch.object(subghz, "md5", return_value="0" * 32),
+            patch.object(subghz, "remove", return_value=True) as mock_remove,
+            patch.object(subghz, "write", return_value=True) as mock_write,
+        ):
+            pool = subghz.temp_signal_pool(size=1)
+            with pool.signal("01") as path:
+                pass
+
+        mock_remove.assert_called_once_with(path)
+        mock_write.assert_called_once()
+
+    def test_stale_slot_with_same_content_kept(self, subghz):
+        payload = b"".join(encode_text_lines(create_sub_content(hex_key="01")))
+        with (
+            patch.object(
+                subghz, "stat", return_value={"type": "file", "size": len(payload)}
+            ),
+            patch.object(subghz, "md5", return_value=hashlib.md5(payload).hexdigest()),
+            patch.object(subghz, "remove") as mock_remove,
+            patch.object(subghz, "write") as mock_write,
+        ):
+            pool = subghz.temp_signal_pool(size=1)
+            assert pool.write(pool.slots[0], "01") is False
+            assert pool.write(pool.slots[0], "01") is False
+
+        mock_remove.assert_not_called()
+        mock_write.assert_not_called()
+
+    def test_cleanup_on_exit(self, subghz):
+        with (
+            patch.object(subghz, "stat", return_value=None),
+            patch.object(subghz, "write", return_value=True),
+            patch.object(
+                subghz.cli,
+                "send_commands",
+                side_effect=lambda commands: [b">: "] * len(commands),
+            ) as mock_send,
+        ):
+            with subghz.temp_signal_pool(size=3) as pool:
+                with pool.signal("01"), pool.signal("02"):
+                    pass
+
+        mock_send.assert_called_once_with(
+            [
+                "storage remove /any/subghz/_temp_slot_0.sub",
+                "storage remove /any/subghz/_temp_slot_1.sub",
+                "storage remove /any/subghz/_temp_slot_2.sub",
+            ]
+        )
+
+
+class TestRawCodec:
+    """Test RAW_Data parsing and encoding."""
+
+    RAW_FILE = (
+        "Filetype: Flipper SubGhz RAW File\n"
+        "Version: 1\n"
+        "Frequency: 433920000\n"
+        "Preset: FuriHalSubGhzPresetOok650Async\n"
+        "Protocol: RAW\n"
+        "RAW_Data: 100 -200 300\n"
+        "RAW_Data: -400 500\n"
+    )
+
+    def test_parse_keeps_every_line(self):
+        header, timings = parse_raw_data(io.StringIO(self.RAW_FILE))
+
+        assert header["Protocol"] == "RAW"
+        assert RAW_DATA_KEY not in header
+        assert list(timings) == [100, -200, 300, -400, 500]
+        assert timings.itemsize == 4
+
+    def test_parse_without_numpy(self):
+        with patch("flipperfs.extras.subghz.np", None):
+            _, timings = parse_raw_data(io.StringIO(self.RAW_FILE))
+
+        assert isinstance(timings, array)
+        assert timings.tolist() == [100, -200, 300, -400, 500]
+
+    def test_encode_wraps_lines(self):
+        timings = array("i", range(-600, 600))
+        lines = list(encode_raw_data(timings))
+
+        assert len(lines) == 3
+        assert lines[0].startswith("RAW_Data: -600 -599")
+        assert len(lines[0].split()) == 513  # key + 512 values
+
+        _, decoded = parse_raw_data(lines)
+        assert list(decoded) == list(timings)
+        assert list(encode_raw_data(iter([1, 2]))) == ["RAW_Data: 1 2"]
+
+    def test_raw_signal_round_trip(self, subghz):
+        subghz.RAW_UPLOAD_BATCH = 4096
+        timings = array("i", [100, -200] * 1000)
+
+        with (
+            patch.object(subghz, "exists", return_value=True),
+            patch.object(subghz, "remove") as mock_remove,
+            patch.object(subghz, "write_many") as mock_write,
+        ):
+            subghz.write_raw_signal("capture", timings, frequency=315000000)
+        mock_remove.assert_called_once_with("/any/subghz/capture.sub")
+
+        # Uploaded in bounded batches
+        batches = [
+            c[0][0]["/any/subghz/capture.sub"] for c in mock_write.call_args_list
+        ]
+        assert len(batches) > 1
+        assert all(len(batch) < 2 * subghz.RAW_UPLOAD_BATCH for batch in batches)
+
+        # Read back from a single streamed read
+        content = b"".join(batches)
+        subghz.cli.serial.read.side_effect = [
+            f"Size: {len(content)}\r\n".encode() + content[:5000],
+            content[5000:] + b"\r\n>: ",
+        ]
+        header, decoded = subghz.read_raw_signal("capture.sub")
+
+        subghz.cli.serial.write.assert_called_once_with(
+            b"storage read /any/subghz/capture.sub\r"
+        )
+        assert header["Frequency"] == "315000000"
+        assert list(decoded) == list(timings)
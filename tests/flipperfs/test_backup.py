@@ -0,0 +1,95 @@
+"""Test suite for flipperfs.backup module."""
+
+import hashlib
+from unittest.mock import MagicMock
+import pytest
+from flipperfs.backup import BackupRepository
+from flipperfs.exceptions import ReadError
+
+
+def make_storage(files):
+    """Mock storage serving files, a dict of remote path to content."""
+    storage = MagicMock()
+    storage.capabilities.uid = "0123456789ABCDEF"
+    storage.walk.side_effect = lambda root: (
+        [("directory", "/ext/empty", None)]
+        + [("file", path, len(data)) for path, data in files.items()]
+    )
+    storage.md5.side_effect = lambda path: hashlib.md5(files[path]).hexdigest()
+
+    def read_to(path, sink, verify=False, expected_md5=None):
+        with open(sink, "wb") as f:
+            f.write(files[path])
+        return len(files[path])
+
+    storage.read_to.side_effect = read_to
+    storage.exists.return_value = True
+    return storage
+
+
+class TestBackupRepository:
+    """Test incremental snapshots."""
+
+    def test_incremental_backup(self, tmp_path):
+        repo = BackupRepository(str(tmp_path))
+        files = {"/ext/a.sub": b"aaa", "/ext/dir/b.sub": b"bbb"}
+        storage = make_storage(files)
+
+        first = repo.backup(storage, "/ext/", name="first")
+        assert storage.read_to.call_count == 2
+
+        # Only changed content is downloaded, identical content stored once
+        files["/ext/dir/b.sub"] = b"changed"
+        files["/ext/copy.sub"] = b"aaa"
+        storage.read_to.reset_mock()
+        second = repo.backup(storage, "/ext")
+
+        storage.read_to.assert_called_once()
+        source, sink = storage.read_to.call_args[0]
+        assert source == "/ext/dir/b.sub"
+        assert storage.read_to.call_args[1] == {
+            "verify": True,
+            "expected_md5": hashlib.md5(b"changed").hexdigest(),
+        }
+        assert repo.snapshots() == sorted([first, second])
+        manifest = repo.load_manifest(second)
+        assert manifest["files"]["copy.sub"] == {
+            "size": 3,
+            "md5": hashlib.md5(b"aaa").hexdigest(),
+        }
+        assert manifest["directories"] == ["empty"]
+        assert manifest["device"] == "0123456789ABCDEF"
+        assert len(list((tmp_path / "objects").rglob("*"))) == 3 + 3  # 3 dirs
+
+    def test_backup_detects_corruption(self, tmp_path):
+        repo = BackupRepository(str(tmp_path))
+        storage = make_storage({"/ext/a.sub": b"aaa"})
+        storage.read_to.side_effect = ReadError("Verification failed for /ext/a.sub")
+
+        with pytest.raises(ReadError, match="Verification failed"):
+            repo.backup(storage, "/ext")
+
+        # Neither the object nor its temporary file is left behind
+        assert not [p for p in (tmp_path / "objects").rglob("*") if p.is_file()]
+        assert repo.snapshots() == []
+
+    def test_restore_pushes_differences(self, tmp_path):
+        repo = BackupRepository(str(tmp_path))
+        files = {"/ext/a.sub": b"aaa", "/ext/b.sub": b"bbb"}
+        repo.backup(make_storage(files), "/ext", name="snap")
+
+        # Device drifted: b.sub changed and the empty directory is gone
+        device = make_storage({"/ext/a.sub": b"aaa", "/ext/b.sub": b"bbx"})
+        device.walk.side_effect = lambda root: [
+            ("file", "/ext/a.sub", 3),
+            ("file", "/ext/b.sub", 3),
+        ]
+        written = repo.restore(device, "snap")
+
+        assert written == ["/ext/b.sub"]
+        device.mkdir.assert_called_once_with("/ext/empty")
+        device.remove.assert_called_once_with("/ext/b.sub")
+        # Differing files are streamed from the object store in one batch
+        device.write_many.assert_called_once_with(
+            {"/ext/b.sub": repo.object_path(hashlib.md5(b"bbb").hexdigest())}
+        )
@@ -0,0 +1,131 @@
+"""Test suite for flipperfs.capabilities module."""
+
+from unittest.mock import patch
+import pytest
+from flipperfs.capabilities import DeviceCapabilities, probe_capabilities
+from flipperfs.exceptions import ReadError
+
+RESPONSES = {
+    "device_info": (
+        b"device_info\r\n"
+        b"hardware_uid               : 0123456789ABCDEF\r\n"
+        b"firmware_version           : 0.98.3\r\n"
+        b"firmware_origin_fork       : Official\r\n"
+        b"\r\n>: "
+    ),
+    "help": (
+        b"help\r\n"
+        b"Commands available:\r\n"
+        b"!                        device_info              storage\r\n"
+        b"help                     start_rpc_session        subghz\r\n"
+        b"\r\n>: "
+    ),
+    "storage": (
+        b"storage\r\n"
+        b"Usage:\r\n"
+        b"storage <cmd> <path> <args>\r\n"
+        b"The path must start with /int or /ext\r\n"
+        b"Cmd list:\r\n"
+        b"\tinfo\t - get FS info\r\n"
+        b"\tlist\t - list files and dirs\r\n"
+        b"\tread\t - read text from file and print file size and content to cli\r\n"
+        b"\tmd5\t - md5 hash of the file\r\n"
+        b"\r\n>: "
+    ),
+}
+
+
+class TestCapabilities:
+    """Test capability probing and caching."""
+
+    def test_probe_and_cache(self, storage, tmp_path):
+        with patch.object(
+            storage.cli, "send_command_raw", side_effect=RESPONSES.get
+        ) as mock_send:
+            capabilities = probe_capabilities(storage.cli, str(tmp_path))
+
+        assert capabilities.uid == "0123456789ABCDEF"
+        assert capabilities.firmware_version == "0.98.3"
+        assert capabilities.rpc is True
+        assert "device_info" in capabilities.commands
+        assert capabilities.storage_commands == {"info", "list", "read", "md5"}
+        assert capabilities.supports("read") is True
+        assert capabilities.supports("read_chunks") is False
+        assert capabilities.chunk_offsets is False
+        assert mock_send.call_count == 3
+        assert len(list(tmp_path.iterdir())) == 1
+
+        # Known device: only device_info is sent
+        with patch.object(
+            storage.cli, "send_command_raw", side_effect=RESPONSES.get
+        ) as mock_send:
+            cached = storage.probe_capabilities(str(tmp_path))
+
+        mock_send.assert_called_once_with("device_info")
+        assert cached.storage_commands == capabilities.storage_commands
+
+    def test_unprobed_supports_everything(self):
+        assert DeviceCapabilities().supports("read_chunks") is True
+        # Ranged reads are never assumed
+        assert DeviceCapabilities().chunk_offsets is False
+
+    def test_probe_chunk_offsets(self, storage, tmp_path):
+        responses = dict(RESPONSES)
+        responses["storage"] = (
+            b"storage\r\n"
+            b"Cmd list:\r\n"
+            b"\tread_chunks\t - read data by chunks (<path> <size> <offset>)\r\n"
+            b"\r\n>: "
+        )
+        with patch.object(storage.cli, "send_command_raw", side_effect=responses.get):
+            capabilities = probe_capabilities(storage.cli, str(tmp_path))
+
+        assert capabilities.chunk_offsets is True
+        assert DeviceCapabilities.from_dict(capabilities.to_dict()).chunk_offsets
+
+    def test_read_binary_without_read_chunks(self, storage):
+        storage.capabilities = DeviceCapabilities(storage_commands={"read"})
+        storage.cli.serial.in_waiting = 4096
+        storage.cli.serial.read.side_effect = [
+            b"storage read /a.bin\r\nSize: 8\r\n\x00\x01>:\x02\x03\r\n",
+            b"\r\n>: ",
+        ]
+
+        # Prompt marker and trailing newline in binary content are kept
+        assert storage.read_binary("/a.bin") == b"\x00\x01>:\x02\x03\r\n"
+        storage.cli.serial.write.assert_called_once_with(b"storage read /a.bin\r")
+
+    def test_read_binary_short_read(self, storage):
+        storage.capabilities = DeviceCapabilities(storage_commands={"read"})
+        storage.cli.serial.in_waiting = 4096
+        storage.cli.serial.read.side_effect = [b"Size: 8\r\n\x00\x01"] + [b""] * 1000
+
+        with (
+            patch("flipperfs.serial_cli.time.time", side_effect=range(1000)),
+            pytest.raises(ReadError, match="6 bytes missing"),
+        ):
+            storage.read_binary("/a.bin")
+
+    def test_tree_falls_back_to_recursive_list(self, storage):
+        storage.capabilities = DeviceCapabilities(storage_commands={"list", "stat"})
+        listings = {
+            "/ext/src": [
+                {"type": "directory", "name": "sub", "path": "/ext/src/sub"},
+                {"type": "file", "name": "a", "size": 1, "path": "/ext/src/a"},
+            ],
+            "/ext/src/sub": [
+                {"type": "file", "name": "b", "size": 2, "path": "/ext/src/sub/b"},
+            ],
+        }
+
+        with (
+            patch.object(storage, "stat", return_value={"type": "directory"}),
+            patch.object(storage, "list", side_effect=listings.get),
+        ):
+            entries = storage.walk("/ext/src")
+
+        assert entries == [
+            ("directory", "/ext/src/sub", None),
+            ("file", "/ext/src/sub/b", 2),
+            ("file", "/ext/src/a", 1),
+        ]
@@ -0,0 +1,105 @@
+"""Test suite for flipperfs.file module."""
+
+from unittest.mock import patch
+import pytest
+from flipperfs.capabilities import DeviceCapabilities
+from flipperfs.exceptions import FileNotFoundError
+
+
+class TestFlipperFile:
+    """Test seekable file objects returned by FlipperStorage.open."""
+
+    @pytest.fixture
+    def ranged(self, storage):
+        storage.capabilities = DeviceCapabilities(chunk_offsets=True)
+        return storage
+
+    def test_sequential_read_ahead(self, ranged):
+        storage = ranged
+        data = bytes(range(256)) * 20  # 5120 bytes
+
+        def read_chunk(path, offset, size):
+            return data[offset : offset + size]
+
+        with (
+            patch.object(storage, "stat", return_value={"type": "file", "size": 5120}),
+            patch.object(storage, "read_chunk", side_effect=read_chunk) as mock_read,
+        ):
+            with storage.open("/ext/data.bin") as f:
+                assert f.read() == data
+
+        # First chunk alone, then a window of 4 chunks in a single round trip
+        assert mock_read.call_args_list[0][0] == ("/ext/data.bin", 0, 1024)
+        assert mock_read.call_args_list[1][0] == ("/ext/data.bin", 1024, 4096)
+        assert mock_read.call_count == 2
+
+    def test_seek_and_readinto(self, ranged):
+        storage = ranged
+        data = b"0123456789" * 300
+
+        def read_chunk(path, offset, size):
+            return data[offset : offset + size]
+
+        with (
+            patch.object(
+                storage, "stat", return_value={"type": "file", "size": len(data)}
+            ),
+            patch.object(storage, "read_chunk", side_effect=read_chunk) as mock_read,
+        ):
+            with storage.open("/ext/data.bin", chunk_size=256) as f:
+                f.seek(2000)
+                assert f.read(5) == data[2000:2005]
+                f.seek(-3, 2)
+                buffer = bytearray(3)
+                assert f.readinto(buffer) == 3
+                assert bytes(buffer) == data[-3:]
+                assert f.read() == b""
+                f.seek(2001)
+                assert f.read(2) == data[2001:2003]
+
+        # The header read never downloads the whole file
+        assert mock_read.call_count == 2
+
+    def test_without_ranged_reads_file_is_streamed_once(self, storage):
+        data = bytes(range(256)) * 20
+        storage.cli.serial.read.side_effect = [
+            b"storage read /ext/data.bin\r\nSize: 5120\r\n",
+            data[:3000],
+            data[3000:] + b"\r\n>: ",
+        ]
+
+        with patch.object(storage, "stat", return_value={"type": "file", "size": 5120}):
+            with storage.open("/ext/data.bin") as f:
+                assert f.read(256) == data[:256]
+                f.seek(4000)
+                assert f.read(10) == data[4000:4010]
+                f.seek(0)
+                assert f.read() == data
+
+        storage.cli.serial.write.assert_called_once_with(
+            b"storage read /ext/data.bin\r"
+        )
+
+    def test_open_missing_file(self, storage):
+        with patch.object(storage, "stat", return_value=None):
+            with pytest.raises(FileNotFoundError):
+                storage.open("/ext/missing.bin")
+
+    def test_buffered_write(self, storage):
+        with (
+            patch.object(storage, "exists", return_value=True),
+            patch.object(storage, "remove") as mock_remove,
+            patch.object(storage, "write_binary") as mock_write_binary,
+        ):
+            with storage.open("/ext/out.bin", "wb", chunk_size=8) as f:
+                f.write(b"abc")
+                f.write(b"def")
+                f.write(b"ghijk")
+
+        mock_remove.assert_called_once_with("/ext/out.bin")
+        written = b"".join(c[0][1] for c in mock_write_binary.call_args_list)
+        assert written == b"abcdefghijk"
+
+    def test_invalid_mode(self, storage):
+        with pytest.raises(ValueError):
+            storage.open("/ext/data.bin", "r+")
@@ -0,0 +1,75 @@
+"""Test suite for flipperfs.parsers module."""
+
+from flipperfs import parsers
+
+
+class TestParsers:
+    """Test bytes-level response parsers."""
+
+    def test_strip_response(self):
+        response = b"storage info /ext\r\nLabel: SD\r\nType: FAT32\r\n\r\n>: "
+        body = parsers.strip_response(response, "storage info /ext")
+        assert body == b"Label: SD\r\nType: FAT32\r\n\r\n"
+
+    def test_parse_entries(self):
+        response = (
+            b"storage list /ext/subghz\r\n"
+            b"\t[D] saved\r\n"
+            b"\t[F] my signal.sub 158b\r\n"
+            b"\t[F] b.sub 0b\r\n"
+            b"\r\n>: "
+        )
+        assert list(parsers.parse_entries(response)) == [
+            ("directory", "saved", None),
+            ("file", "my signal.sub", 158),
+            ("file", "b.sub", 0),
+        ]
+
+    def test_parse_key_values(self):
+        response = b"Label: SD\r\nType: FAT32\r\nTotal: 1000 KiB\r\n>: "
+        assert parsers.parse_key_values(response) == {
+            "Label": "SD",
+            "Type": "FAT32",
+            "Total": "1000 KiB",
+        }
+
+    def test_parse_stat(self):
+        assert parsers.parse_stat(b"File, size: 158b\r\n") == ("file", 158)
+        assert parsers.parse_stat(b"Directory\r\n") == ("directory", None)
+        assert parsers.parse_stat(b"Storage, 100KiB total\r\n") == ("directory", None)
+        assert parsers.parse_stat(b"Storage error: file/dir not exist\r\n") is None
+        assert parsers.parse_stat(b"Invalid path\r\n") is None
+
+    def test_parse_read_uses_size(self):
+        response = b"storage read /a.txt\r\nSize: 7\r\nab\r\n>:c\r\n\r\n>: "
+        assert parsers.parse_read(response) == b"ab\r\n>:c"
+        assert parsers.parse_read(b"Storage error: file/dir not exist\r\n>: ") is None
+
+    def test_parse_hex_data(self):
+        response = b"storage read_chunks /a 4 0\r\nSize: 4\r\n00 01\r\nfe ff\r\n>: "
+        assert parsers.parse_hex_data(response) == b"\x00\x01\xfe\xff"
+        assert parsers.parse_hex_data(b"Storage error\r\n>: ") is None
+
+    def test_parse_md5(self):
+        digest = b"d41d8cd98f00b204e9800998ecf8427e"
+        assert parsers.parse_md5(b"storage md5 /a\r\n" + digest + b"\r\n>: ") == (
+            digest.decode()
+        )
+        assert parsers.parse_md5(b"Storage error\r\n>: ") is None
+
+    def test_find_error(self):
+        assert parsers.find_error(b"\r\n>: ") is None
+        assert (
+            parsers.find_error(b"Storage error: file/dir not exist\r\n>: ")
+            == "Storage error: file/dir not exist"
+        )
+        listing = b"\t[F] /ext/logs/Error_2024.txt 10b\r\n\t[D] /ext/Error\r\n>: "
+        assert parsers.find_error(listing) is None
+        assert parsers.find_error(b"storage write /ext/Error.txt\r\n>: ") is None
+
+    def test_split_responses(self):
+        data = b"cmd a\r\n\r\n>: cmd b\r\nout\r\n\r\n>: partial"
+        assert parsers.split_responses(data) == [
+            b"cmd a\r\n\r\n>:",
+            b" cmd b\r\nout\r\n\r\n>:",
+        ]
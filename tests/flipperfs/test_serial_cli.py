@@ -30,3 +30,16 @@ class TestSerialCLI:
 
         assert "response" in response
         mock_conn.write.assert_called()
+
+    @patch("flipperfs.serial_cli.serial.Serial")
+    def test_send_command_raw_stops_at_split_prompt(self, mock_serial):
+        mock_conn = MagicMock()
+        mock_conn.is_open = True
+        mock_conn.in_waiting = 10
+        mock_conn.read.side_effect = [b"line\r\n>", b": ", b"never read"]
+        mock_serial.return_value = mock_conn
+
+        cli = SerialCLI("/dev/test")
+        response = cli.send_command_raw("test command")
+
+        assert response == b"line\r\n>: "
@@ -1,6 +1,18 @@
 """Test suite for flipperfs.storage module."""
 
+import hashlib
+import io
+import tarfile
 from unittest.mock import MagicMock, patch
+import pytest
+from flipperfs.capabilities import DeviceCapabilities
+from flipperfs.entry import DirEntry
+from flipperfs.exceptions import (
+    FileNotFoundError,
+    FlipperFilesystemError,
+    ReadError,
+    WriteError,
+)
 from flipperfs.storage import FlipperStorage
 
 
@@ -15,13 +27,13 @@ class TestFlipperStorage:
         mock_serial.return_value = mock_conn
 
         # Mock the send_command response
-        list_response = """[F] test1.sub 158b
+        list_response = b"""[F] test1.sub 158b
 [F] test2.sub 200b
 [D] subdir
 >:"""
 
         storage = FlipperStorage("/dev/test")
-        with patch.object(storage.cli, "send_command", return_value=list_response):
+        with patch.object(storage.cli, "send_command_raw", return_value=list_response):
             files = storage.list("/any/subghz")
 
         assert len(files) == 3
@@ -36,13 +48,13 @@ class TestFlipperStorage:
         mock_conn.is_open = True
         mock_serial.return_value = mock_conn
 
-        read_response = """Size: 50
+        read_response = b"""Size: 50
 Test content
 Line 2
 >:"""
 
         storage = FlipperStorage("/dev/test")
-        with patch.object(storage.cli, "send_command", return_value=read_response):
+        with patch.object(storage.cli, "send_command_raw", return_value=read_response):
             content = storage.read("/test.txt")
 
         assert "Test content" in content
@@ -54,10 +66,10 @@ Line 2
         mock_conn.is_open = True
         mock_serial.return_value = mock_conn
 
-        stat_response = "File, size: 158b"
+        stat_response = b"File, size: 158b"
 
         storage = FlipperStorage("/dev/test")
-        with patch.object(storage.cli, "send_command", return_value=stat_response):
+        with patch.object(storage.cli, "send_command_raw", return_value=stat_response):
             stats = storage.stat("/test.sub")
 
         assert stats["type"] == "file"
@@ -89,3 +101,459 @@ Line 2
             assert storage is not None
 
         mock_conn.close.assert_called()
+
+    @patch("flipperfs.serial_cli.serial.Serial")
+    def test_read_binary_chunks_by_offset(self, mock_serial):
+        mock_conn = MagicMock()
+        mock_conn.is_open = True
+        mock_serial.return_value = mock_conn
+
+        responses = [
+            b"Size: 4\n00 01 02 03\n>:",
+            b"Size: 2\n04 05\n>:",
+        ]
+
+        storage = FlipperStorage("/dev/test")
+        storage.capabilities = DeviceCapabilities(chunk_offsets=True)
+        with patch.object(
+            storage.cli, "send_command_raw", side_effect=responses
+        ) as mock_send:
+            data = storage.read_binary("/test.bin", chunk_size=4)
+
+        assert data == bytes(range(6))
+        assert mock_send.call_args_list[1][0][0] == (
+            "storage read_chunks /test.bin 4 4"
+        )
+
+    @patch("flipperfs.serial_cli.serial.Serial")
+    def test_read_chunk_without_offsets_slices_stream(self, mock_serial):
+        mock_conn = MagicMock()
+        mock_conn.is_open = True
+        mock_serial.return_value = mock_conn
+
+        storage = FlipperStorage("/dev/test")
+        with patch.object(
+            storage, "_iter_read", return_value=(c for c in [b"abc", b"def", b"gh"])
+        ):
+            assert storage.read_chunk("/test.bin", 2, 5) == b"cdefg"
+
+
+class TestFlipperStorageStreaming:
+    """Test streaming reads."""
+
+    RESPONSE = [
+        b"storage read /log.txt\r\nSi",
+        b"ze: 15\r\nfirst\r\n>:",
+        b" ond\r\n\r\n\r\n>",
+        b": ",
+    ]
+
+    def test_read_to_file_object(self, storage):
+        storage.cli.serial.read.side_effect = self.RESPONSE
+        sink = io.BytesIO()
+
+        assert storage.read_to("/log.txt", sink) == 15
+        assert sink.getvalue() == b"first\r\n>: ond\r\n"
+
+    def test_read_to_path(self, storage, tmp_path):
+        storage.cli.serial.read.side_effect = self.RESPONSE
+        target = tmp_path / "log.txt"
+
+        storage.read_to("/log.txt", str(target))
+        assert target.read_bytes() == b"first\r\n>: ond\r\n"
+
+    def test_iter_lines(self, storage):
+        storage.cli.serial.read.side_effect = self.RESPONSE
+
+        # Content containing the prompt marker is not cut short
+        assert list(storage.iter_lines("/log.txt")) == ["first", ">: ond"]
+
+    def test_iter_lines_drains_on_early_stop(self, storage):
+        storage.cli.serial.read.side_effect = self.RESPONSE + [b"next"]
+
+        lines = storage.iter_lines("/log.txt")
+        assert next(lines) == "first"
+        lines.close()
+
+        # The rest of the response, including the prompt, was consumed
+        assert storage.cli.serial.read.call_count == 4
+
+    def test_iter_lines_file_not_found(self, storage):
+        storage.cli.serial.read.side_effect = [
+            b"storage read /x\r\nStorage error: file/dir not exist\r\n\r\n>: "
+        ]
+
+        with pytest.raises(FileNotFoundError):
+            list(storage.iter_lines("/x"))
+
+
+class TestFlipperStorageTrees:
+    """Test device-side recursive operations."""
+
+    TREE_RESPONSE = (
+        b"storage tree /ext/src\r\n"
+        b"\t[D] /ext/src/sub\r\n"
+        b"\t[F] /ext/src/a.sub 10b\r\n"
+        b"\t[F] /ext/src/sub/b.sub 20b\r\n"
+        b"\t[D] /ext/src/sub/deeper\r\n"
+        b"\r\n>: "
+    )
+
+    def test_copytree(self, storage):
+        with (
+            patch.object(
+                storage.cli, "send_command_raw", return_value=self.TREE_RESPONSE
+            ),
+            patch.object(
+                storage.cli, "send_commands", side_effect=lambda c: [b">: "] * len(c)
+            ) as mock_send,
+        ):
+            assert storage.copytree("/ext/src", "/ext/dst/") is True
+
+        assert mock_send.call_args[0][0] == [
+            "storage mkdir /ext/dst",
+            "storage mkdir /ext/dst/sub",
+            "storage mkdir /ext/dst/sub/deeper",
+            "storage copy /ext/src/a.sub /ext/dst/a.sub",
+            "storage copy /ext/src/sub/b.sub /ext/dst/sub/b.sub",
+        ]
+
+    def test_tree_entry_named_error(self, storage):
+        response = (
+            b"storage tree /ext/logs\r\n\t[F] /ext/logs/Error_2024.txt 10b\r\n\r\n>: "
+        )
+        with patch.object(storage.cli, "send_command_raw", return_value=response):
+            entries = storage.walk("/ext/logs")
+
+        assert entries == [("file", "/ext/logs/Error_2024.txt", 10)]
+
+    def test_tree_missing_path(self, storage):
+        response = b"storage tree /ext/x\r\nStorage error: file/dir not exist\r\n>: "
+        with patch.object(storage.cli, "send_command_raw", return_value=response):
+            with pytest.raises(FileNotFoundError, match="not exist"):
+                storage.walk("/ext/x")
+
+    def test_rmtree_order_and_errors(self, storage):
+        responses = [b">: "] * 4 + [b"Storage error: internal error\r\n>: "]
+        with (
+            patch.object(
+                storage.cli, "send_command_raw", return_value=self.TREE_RESPONSE
+            ),
+            patch.object(
+                storage.cli, "send_commands", return_value=responses
+            ) as mock_send,
+        ):
+            with pytest.raises(FlipperFilesystemError, match="storage remove /ext/src"):
+                storage.rmtree("/ext/src")
+
+        assert mock_send.call_args[0][0] == [
+            "storage remove /ext/src/a.sub",
+            "storage remove /ext/src/sub/b.sub",
+            "storage remove /ext/src/sub/deeper",
+            "storage remove /ext/src/sub",
+            "storage remove /ext/src",
+        ]
+
+    def test_movetree_falls_back_to_copy(self, storage):
+        with (
+            patch.object(
+                storage, "rename", side_effect=FlipperFilesystemError("cross")
+            ),
+            patch.object(storage, "copytree", return_value=True) as mock_copytree,
+            patch.object(storage, "rmtree", return_value=True) as mock_rmtree,
+        ):
+            assert storage.movetree("/int/src", "/ext/src") is True
+
+        mock_copytree.assert_called_once_with("/int/src", "/ext/src")
+        mock_rmtree.assert_called_once_with("/int/src")
+
+    def test_send_commands_pipelined(self, storage):
+        storage.cli.serial.in_waiting = 100
+        storage.cli.serial.read.side_effect = [
+            b"storage remove /a\r\n\r\n>",
+            b": storage remove /b\r\nStorage error: file/dir not exist\r\n\r\n>: ",
+        ]
+
+        responses = storage.cli.send_commands(
+            ["storage remove /a", "storage remove /b"]
+        )
+
+        storage.cli.serial.write.assert_called_once_with(
+            b"storage remove /a\rstorage remove /b\r"
+        )
+        assert len(responses) == 2
+        assert b"error" in responses[1]
+
+
+class TestFlipperStorageIterdir:
+    """Test streaming directory listings."""
+
+    def test_iterdir_streams_entries(self, storage):
+        storage.cli.serial.read.side_effect = [
+            b"storage list /ext\r\n\t[D] subghz\r\n\t[F] a.s",
+            b"ub 10b\r\n\t[F] b.txt 5b\r\n\r\n>",
+            b": ",
+        ]
+
+        entries = storage.iterdir("/ext")
+        first = next(entries)
+        # Yielded before the rest of the listing was read
+        assert storage.cli.serial.read.call_count == 1
+        assert first == DirEntry("/ext", "subghz", "directory", None)
+
+        rest = list(entries)
+        assert [entry.path for entry in rest] == ["/ext/a.sub", "/ext/b.txt"]
+        assert rest[0].size == 10
+        assert rest[0].to_dict() == {
+            "type": "file",
+            "name": "a.sub",
+            "size": 10,
+            "path": "/ext/a.sub",
+        }
+
+    def test_iterdir_filters(self, storage):
+        storage.cli.serial.read.side_effect = [
+            b"\t[D] dir.sub\r\n\t[F] a.sub 10b\r\n\t[F] b.txt 5b\r\n\r\n>: "
+        ]
+
+        entries = list(storage.iterdir("/ext", entry_type="file", suffix=".sub"))
+        assert entries == [DirEntry("/ext", "a.sub", "file", 10)]
+
+    def test_iterdir_drains_on_early_stop(self, storage):
+        storage.cli.serial.read.side_effect = [
+            b"\t[F] a.sub 10b\r\n",
+            b"\t[F] b.sub 10b\r\n\r\n>",
+            b": ",
+            b"never read",
+        ]
+
+        entries = storage.iterdir("/ext")
+        next(entries)
+        entries.close()
+
+        assert storage.cli.serial.read.call_count == 3
+
+    def test_dir_entry_slots(self):
+        entry = DirEntry("/ext", "a.sub", "file", 10)
+        assert not hasattr(entry, "__dict__")
+        assert entry.is_file() and not entry.is_dir()
+
+
+class TestFlipperStorageBundle:
+    """Test bundled uploads."""
+
+    @pytest.fixture
+    def local_dir(self, tmp_path):
+        (tmp_path / "ir").mkdir()
+        (tmp_path / "a.sub").write_bytes(b"abc")
+        (tmp_path / "ir" / "tv.ir").write_bytes(b"x" * 1500)
+        return str(tmp_path)
+
+    UPLOADED = [
+        ("file", "/ext/deploy/a.sub", 3),
+        ("directory", "/ext/deploy/ir", None),
+        ("file", "/ext/deploy/ir/tv.ir", 1500),
+    ]
+
+    def test_pipelined_fallback(self, storage, local_dir):
+        with (
+            patch.object(storage, "exists", return_value=True),
+            patch.object(
+                storage,
+                "walk",
+                side_effect=[[("file", "/ext/deploy/a.sub", 1)], self.UPLOADED],
+            ),
+            patch.object(storage, "_run_commands") as mock_run,
+            patch.object(
+                storage.cli,
+                "send_pipelined",
+                side_effect=lambda p, **kw: [b">:"] * len(p),
+            ) as mock_pipelined,
+        ):
+            assert storage.upload_bundle(local_dir, "/ext/deploy/") is True
+
+        assert mock_run.call_args[0][0] == [
+            "storage mkdir /ext/deploy/ir",
+            "storage remove /ext/deploy/a.sub",
+        ]
+        payloads = mock_pipelined.call_args[0][0]
+        assert len(payloads) == 3  # a.sub plus two chunks of tv.ir
+        assert payloads[0] == (b"storage write_chunk /ext/deploy/a.sub 3\r616263\r\x03")
+        assert payloads[2].startswith(b"storage write_chunk /ext/deploy/ir/tv.ir 476\r")
+
+    def test_write_many_streams_in_batches(self, storage, local_dir):
+        storage.WRITE_BATCH = 2
+        with patch.object(
+            storage.cli, "send_pipelined", side_effect=lambda p, **kw: [b">:"] * len(p)
+        ) as mock_pipelined:
+            storage.write_many(
+                {
+                    "/ext/tv.ir": f"{local_dir}/ir/tv.ir",
+                    "/ext/empty": b"",
+                    "/ext/a.sub": b"abc",
+                }
+            )
+
+        batches = [c[0][0] for c in mock_pipelined.call_args_list]
+        assert [len(batch) for batch in batches] == [2, 2]
+        assert batches[0][1].startswith(b"storage write_chunk /ext/tv.ir 476\r")
+        assert batches[1] == [
+            b"storage write /ext/empty\r\x03",
+            b"storage write_chunk /ext/a.sub 3\r616263\r\x03",
+        ]
+
+    def test_write_many_reports_errors(self, storage):
+        with patch.object(
+            storage.cli,
+            "send_pipelined",
+            return_value=[b"Storage error: out of space\r\n>:"],
+        ):
+            with pytest.raises(WriteError, match="/ext/a.sub: Storage error"):
+                storage.write_many({"/ext/a.sub": b"abc"})
+
+    def test_archive_extraction(self, storage, local_dir):
+        storage.capabilities = DeviceCapabilities(
+            storage_commands={"extract", "write_chunk", "tree"}
+        )
+        with (
+            patch.object(storage, "exists", return_value=True),
+            patch.object(storage, "remove") as mock_remove,
+            patch.object(storage, "walk", return_value=self.UPLOADED),
+            patch.object(storage, "_run_commands") as mock_run,
+            patch.object(storage, "write_many") as mock_write,
+        ):
+            storage.upload_bundle(local_dir, "/ext/deploy")
+
+        ((archive, data),) = mock_write.call_args[0][0].items()
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            assert sorted(tar.getnames()) == ["a.sub", "ir/tv.ir"]
+        assert mock_run.call_args[0][0] == [f"storage extract {archive} /ext/deploy"]
+        mock_remove.assert_called_once_with(archive)
+
+    def test_verification_failure(self, storage, local_dir):
+        with (
+            patch.object(storage, "exists", return_value=False),
+            patch.object(storage, "mkdir"),
+            patch.object(storage, "walk", return_value=self.UPLOADED[:1]),
+            patch.object(storage, "_run_commands"),
+            patch.object(storage, "write_many"),
+        ):
+            with pytest.raises(WriteError, match="ir/tv.ir"):
+                storage.upload_bundle(local_dir, "/ext/deploy")
+
+
+class TestFlipperStorageVerify:
+    """Test end-to-end MD5 verification of transfers."""
+
+    DATA = b"\x00\x01binary\xff" * 10
+    MD5 = hashlib.md5(DATA).hexdigest()
+    BAD_MD5 = "0" * 32
+
+    @pytest.fixture(autouse=True)
+    def no_write_delays(self, storage):
+        storage.cli.read_available = MagicMock(return_value=b">: ")
+        with patch("flipperfs.storage.time.sleep"):
+            yield
+
+    def test_write_binary_verified(self, storage):
+        with patch.object(storage, "md5", return_value=self.MD5) as mock_md5:
+            assert storage.write_binary("/ext/a.bin", self.DATA, verify=True)
+        mock_md5.assert_called_once_with("/ext/a.bin")
+
+    def test_write_binary_not_verified_by_default(self, storage):
+        with patch.object(storage, "md5") as mock_md5:
+            storage.write_binary("/ext/a.bin", self.DATA)
+        mock_md5.assert_not_called()
+
+    def test_write_binary_retries_on_mismatch(self, storage):
+        with (
+            patch.object(storage, "md5", side_effect=[self.BAD_MD5, self.MD5]),
+            patch.object(storage, "remove") as mock_remove,
+            patch.object(storage, "_send_chunks", return_value=self.MD5) as mock_send,
+        ):
+            storage.write_binary("/ext/a.bin", self.DATA, verify=True)
+        mock_remove.assert_called_once_with("/ext/a.bin")
+        assert mock_send.call_count == 2
+
+    def test_write_binary_mismatch_raises(self, storage):
+        with (
+            patch.object(storage, "md5", return_value=self.BAD_MD5),
+            patch.object(storage, "remove") as mock_remove,
+        ):
+            with pytest.raises(WriteError, match=f"local MD5 {self.MD5}"):
+                storage.write_binary("/ext/a.bin", self.DATA, verify=True, retries=2)
+        assert mock_remove.call_count == 2
+
+    def test_write_text_hashes_sent_bytes(self, storage):
+        expected = hashlib.md5(b"a\r\nb\r\n").hexdigest()
+        with patch.object(storage, "md5", return_value=expected):
+            assert storage.write("/ext/a.txt", "a\n\nb", verify=True)
+
+    def test_read_binary_retries_on_mismatch(self, storage):
+        storage.capabilities = DeviceCapabilities(
+            storage_commands={"read_chunks"}, chunk_offsets=True
+        )
+        with (
+            patch.object(storage, "md5", return_value=self.MD5),
+            patch.object(
+                storage, "read_chunk", side_effect=[b"corrupt", self.DATA]
+            ) as mock_read,
+        ):
+            assert storage.read_binary("/ext/a.bin", 1024, verify=True) == self.DATA
+        assert mock_read.call_count == 2
+
+    def test_read_binary_mismatch_raises(self, storage):
+        with (
+            patch.object(storage, "md5", return_value=self.BAD_MD5),
+            patch.object(
+                storage, "_iter_read", side_effect=lambda path: (c for c in [self.DATA])
+            ),
+        ):
+            with pytest.raises(ReadError, match="after 2 attempts"):
+                storage.read_binary("/ext/a.bin", verify=True)
+
+    def test_read_binary_hashes_streamed_chunks(self, storage):
+        chunks = [self.DATA[:7], self.DATA[7:50], self.DATA[50:]]
+        with (
+            patch.object(storage, "md5", return_value=self.MD5),
+            patch.object(storage, "_iter_read", return_value=(c for c in chunks)),
+        ):
+            assert storage.read_binary("/ext/a.bin", verify=True) == self.DATA
+
+    def test_read_to_rewinds_sink_on_retry(self, storage):
+        sink = io.BytesIO(b"header")
+        sink.seek(0, io.SEEK_END)
+        with (
+            patch.object(storage, "md5", return_value=self.MD5),
+            patch.object(
+                storage,
+                "_iter_read",
+                side_effect=[
+                    (c for c in [b"corrupt"]),
+                    (c for c in [self.DATA[:5], self.DATA[5:]]),
+                ],
+            ),
+        ):
+            assert storage.read_to("/ext/a.bin", sink, verify=True) == len(self.DATA)
+        assert sink.getvalue() == b"header" + self.DATA
+
+    def test_read_to_expected_md5(self, storage):
+        sink = io.BytesIO()
+        with (
+            patch.object(storage, "md5") as mock_md5,
+            patch.object(storage, "_iter_read", return_value=(c for c in [self.DATA])),
+        ):
+            storage.read_to("/ext/a.bin", sink, verify=True, expected_md5=self.MD5)
+        mock_md5.assert_not_called()
+
+    def test_read_to_unseekable_sink_not_retried(self, storage):
+        sink = MagicMock(spec=["write"])
+        with (
+            patch.object(storage, "md5", return_value=self.BAD_MD5),
+            patch.object(
+                storage, "_iter_read", return_value=(c for c in [self.DATA])
+            ) as it,
+        ):
+            with pytest.raises(ReadError, match="after 1 attempts"):
+                storage.read_to("/ext/a.bin", sink, verify=True)
+        it.assert_called_once()
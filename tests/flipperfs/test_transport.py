@@ -0,0 +1,82 @@
+"""Test suite for flipperfs.transport module."""
+
+import time
+from unittest.mock import MagicMock
+import pytest
+from flipperfs.exceptions import ConnectionError
+from flipperfs.storage import FlipperStorage
+from flipperfs.transport import (
+    RecordingTransport,
+    ReplayTransport,
+    load_recording,
+)
+
+LIST_RESPONSE = b"storage list /ext\r\n[F] a.sub 10b\r\n[D] dir\r\n\r\n>: "
+
+
+@pytest.fixture
+def recording(tmp_path):
+    """Record a session with a fake device answering one list command."""
+    path = str(tmp_path / "session.ffsr")
+    device = MagicMock()
+    device.is_open = True
+    device.in_waiting = len(LIST_RESPONSE)
+    device.read.side_effect = [LIST_RESPONSE[:20], LIST_RESPONSE[20:]]
+
+    storage = FlipperStorage(transport=RecordingTransport(device, path))
+    entries = storage.list("/ext")
+    storage.close()
+
+    assert [entry["name"] for entry in entries] == ["a.sub", "dir"]
+    return path
+
+
+class TestTransport:
+    """Test recording and replaying sessions."""
+
+    def test_recording_format(self, recording):
+        events = load_recording(recording)
+
+        assert [(direction, data) for direction, _, data in events] == [
+            (b"w", b"storage list /ext\r"),
+            (b"r", LIST_RESPONSE[:20]),
+            (b"r", LIST_RESPONSE[20:]),
+        ]
+        timestamps = [timestamp for _, timestamp, _ in events]
+        assert timestamps == sorted(timestamps)
+
+    def test_replay_without_delays(self, recording):
+        storage = FlipperStorage(transport=ReplayTransport(recording))
+        entries = storage.list("/ext")
+
+        assert entries[0] == {
+            "type": "file",
+            "name": "a.sub",
+            "size": 10,
+            "path": "/ext/a.sub",
+        }
+        assert entries[1]["type"] == "directory"
+
+    def test_replay_at_recorded_speed(self, tmp_path):
+        path = str(tmp_path / "slow.ffsr")
+        device = MagicMock()
+        device.read.side_effect = lambda size: time.sleep(0.05) or b">: "
+        recorder = RecordingTransport(device, path)
+        recorder.write(b"cmd\r")
+        recorder.read(3)
+        recorder.close()
+
+        replay = ReplayTransport(path, speed=1.0)
+        replay.write(b"cmd\r")
+        start = time.monotonic()
+        assert replay.read(10) == b">: "
+        assert time.monotonic() - start >= 0.04
+
+        replay = ReplayTransport(path, speed=10.0)
+        replay.write(b"cmd\r")
+        assert replay.in_waiting == 0  # Not due yet
+
+    def test_strict_replay_mismatch(self, recording):
+        replay = ReplayTransport(recording, strict=True)
+        with pytest.raises(ConnectionError):
+            replay.write(b"storage list /int\r")
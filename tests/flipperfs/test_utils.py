@@ -5,6 +5,7 @@ from flipperfs.utils import (
     parse_size,
     format_sub_key,
     create_sub_content,
+    encode_text_lines,
 )
 
 
@@ -17,6 +18,9 @@ class TestUtils:
         assert normalize_path("//test//file") == "/test/file"
         assert normalize_path("/") == "/"
 
+    def test_encode_text_lines(self):
+        assert list(encode_text_lines("a\n\nb")) == [b"a\r\n", b"b\r\n"]
+
     def test_parse_size(self):
         assert parse_size("158b") == 158
         assert parse_size("2KiB") == 2048